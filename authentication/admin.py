@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.contrib.auth.hashers import make_password
+from .admin_mixins import ChangelistAdminMixin
 from .models import ShrimpFarmingCompany, ExportingCompany
 
 
@@ -8,7 +10,7 @@ from .models import ShrimpFarmingCompany, ExportingCompany
 # and reduce code duplication.
 # =============================================================================
 
-class BaseCompanyAdmin(admin.ModelAdmin):
+class BaseCompanyAdmin(ChangelistAdminMixin, admin.ModelAdmin):
     """
     Abstract base admin class to standardize the display and behavior
     of company models in the Django admin interface.
@@ -30,8 +32,9 @@ class BaseCompanyAdmin(admin.ModelAdmin):
         "updated_at",
     )
 
-    # Enable search across critical business fields
-    search_fields = ("company_name", "ceo_name", "location", "phone_number")
+    # Enable search across critical business fields; phone numbers match
+    # exactly, which the unique index serves
+    search_fields = ("company_name", "ceo_name", "location", "phone_number__exact")
 
     # Add filtering sidebar for location and date-based fields
     list_filter = ("location", "created_at", "updated_at")
@@ -64,6 +67,22 @@ class BaseCompanyAdmin(admin.ModelAdmin):
         ),
     )
 
+    def save_model(self, request, obj, form, change):
+        """Hash the password whenever it is entered or changed in the admin."""
+        if "password" in form.changed_data:
+            obj.password = make_password(form.cleaned_data["password"])
+        super().save_model(request, obj, form, change)
+
+    def get_queryset(self, request):
+        """
+        Skip wide columns on the changelist, which never displays them.
+        The change form still loads complete rows.
+        """
+        queryset = super().get_queryset(request)
+        if self._is_changelist(request):
+            queryset = queryset.defer("address", "logo", "password")
+        return queryset
+
 
 # =============================================================================
 # SPECIFIC ADMIN CLASSES
@@ -0,0 +1,17 @@
+# =============================================================================
+# SHARED ADMIN MIXINS
+# Helpers reused by the ModelAdmin classes of every app.
+# =============================================================================
+
+class ChangelistAdminMixin:
+    """
+    Mixin for admins whose querysets differ between the changelist and the
+    change form (e.g. loading only the columns the list displays).
+    """
+
+    def _is_changelist(self, request):
+        """Return True when the request targets this model's changelist page."""
+        match = getattr(request, "resolver_match", None)
+        return bool(match) and match.url_name == (
+            f"{self.opts.app_label}_{self.opts.model_name}_changelist"
+        )
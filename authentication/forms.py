@@ -1,7 +1,54 @@
+import re
 from django import forms
+from django.contrib.auth.hashers import make_password
 from .models import ShrimpFarmingCompany, ExportingCompany
 
 
+# Separators removed from phone numbers before counting digits
+_PHONE_SEPARATORS = b"+- "
+_PHONE_STRIP = str.maketrans("", "", _PHONE_SEPARATORS.decode())
+
+# Length of the phone_number column on both company models
+PHONE_MAX_LENGTH = ShrimpFarmingCompany._meta.get_field("phone_number").max_length
+
+# Accepted phone shape: optional leading '+', digits separated by dashes or spaces
+_PHONE_PATTERN = re.compile(r"^\+?\d[\d\- ]{8,}\d$")
+
+
+def _clean_phone(phone):
+    """
+    Strip separators from a phone number in a single C-level pass.
+    ASCII input is handled as bytes; numbers typed with non-ASCII digits
+    (e.g. Persian) fall back to str.translate so they keep their digits.
+    """
+    if phone.isascii():
+        return phone.encode("ascii").translate(None, _PHONE_SEPARATORS)
+    return phone.translate(_PHONE_STRIP)
+
+
+def _is_valid_phone(phone):
+    """
+    Return True if phone has the accepted shape, fits the phone_number
+    column and has at least 10 digits.
+    """
+    if not phone or len(phone) > PHONE_MAX_LENGTH or not _PHONE_PATTERN.match(phone):
+        return False
+    return len(_clean_phone(phone)) >= 10
+
+
+def phone_number_error(company, phone):
+    """
+    Return the message explaining why phone cannot become company's number,
+    or None if it can. Used by the dashboard profile edits, which do not go
+    through a form; checking here avoids failing on the UNIQUE constraint.
+    """
+    if not _is_valid_phone(phone):
+        return "شماره تلفن معتبر نیست."
+    if type(company).objects.exclude(pk=company.pk).filter(phone_number=phone).exists():
+        return "این شماره تلفن قبلاً برای شرکت دیگری ثبت شده است."
+    return None
+
+
 # =============================================================================
 # BASE COMPANY FORM
 # Shared form configuration for company registration.
@@ -38,7 +85,7 @@ class BaseCompanyForm(forms.ModelForm):
             "address",
             "logo",
             "phone_number",
-            "password",  # Handled separately for security control
+            "password",  # Hashed in save() before storing
         ]
 
     def clean_phone_number(self):
@@ -48,22 +95,23 @@ class BaseCompanyForm(forms.ModelForm):
         """
         phone = self.cleaned_data.get("phone_number")
         if phone:
-            cleaned_phone = phone.replace("+", "").replace("-", "").replace(" ", "")
+            if not _PHONE_PATTERN.match(phone):
+                raise forms.ValidationError("Phone number may only contain digits, spaces, dashes and a leading +.")
+            cleaned_phone = _clean_phone(phone)
             if len(cleaned_phone) < 10:
                 raise forms.ValidationError("Phone number is too short. Minimum 10 digits required.")
         return phone
 
     def save(self, commit=True):
         """
-        Override save to handle password hashing if needed.
-        Assumes model has `set_password()` method like Django's User model.
-        Adjust logic based on actual model implementation.
+        Override save to store a salted hash instead of the raw password.
+        Login verifies it with django.contrib.auth.hashers.check_password().
         """
         instance = super().save(commit=False)
-        # Example: Hash password if your model supports it
-        # if hasattr(instance, 'set_password'):
-        #     instance.set_password(self.cleaned_data["password"])
-        return instance if not commit else instance.save()
+        instance.password = make_password(self.cleaned_data["password"])
+        if commit:
+            instance.save()
+        return instance
 
 
 # =============================================================================
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_alter_exportingcompany_phone_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportingcompany',
+            name='phone_number',
+            field=models.CharField(max_length=15, unique=True, verbose_name='Phone Number'),
+        ),
+        migrations.AlterField(
+            model_name='shrimpfarmingcompany',
+            name='phone_number',
+            field=models.CharField(max_length=15, unique=True, verbose_name='Phone Number'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import migrations
+
+
+def hash_plaintext_passwords(apps, schema_editor):
+    """Replace any password that is not already a recognised hash with its hash."""
+    for model_name in ("ShrimpFarmingCompany", "ExportingCompany"):
+        model = apps.get_model("authentication", model_name)
+        for company in model.objects.only("id", "password"):
+            try:
+                identify_hasher(company.password)
+            except ValueError:
+                company.password = make_password(company.password)
+                company.save(update_fields=["password"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_alter_exportingcompany_phone_number_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_plaintext_passwords, migrations.RunPython.noop),
+    ]
@@ -1,21 +1,13 @@
-import os
 from django.db import models
 from django.utils import timezone
 
 def company_logo_path(instance, filename):
     """
     Generates the upload path for the company logo based on the company type.
+    Each concrete company model names its folder via the LOGO_FOLDER attribute.
     """
-    # Determine the company type and use it as the folder name
-    if isinstance(instance, ShrimpFarmingCompany):
-        company_type = "ShrimpFarmingCompany"
-    elif isinstance(instance, ExportingCompany):
-        company_type = "ExportingCompany"
-    else:
-        raise ValueError("Unknown company type")
-
-    # Return the full path including the company type folder
-    return os.path.join("logos", company_type, filename)
+    # Storage backends expect forward slashes, so no os.path.join is needed
+    return f"logos/{instance.LOGO_FOLDER}/{filename}"
 
 class CompanyInfoAbstract(models.Model):
     """
@@ -28,7 +20,7 @@ class CompanyInfoAbstract(models.Model):
     logo = models.ImageField(
         upload_to=company_logo_path, null=True, blank=True, verbose_name="Company Logo"
     )
-    phone_number = models.CharField(max_length=15, verbose_name="Phone Number")
+    phone_number = models.CharField(max_length=15, unique=True, verbose_name="Phone Number")
     password = models.CharField(max_length=128, verbose_name="Password")
     created_at = models.DateTimeField(default=timezone.now, verbose_name="Created At")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
@@ -40,6 +32,8 @@ class ShrimpFarmingCompany(CompanyInfoAbstract):
     """
     Model representing a shrimp farming company, inheriting common fields from CompanyInfoAbstract.
     """
+    LOGO_FOLDER = "ShrimpFarmingCompany"
+
     class Meta:
         verbose_name = "Shrimp Farming Company"
         verbose_name_plural = "Shrimp Farming Companies"
@@ -51,6 +45,8 @@ class ExportingCompany(CompanyInfoAbstract):
     """
     Model representing an exporting company, inheriting common fields from CompanyInfoAbstract.
     """
+    LOGO_FOLDER = "ExportingCompany"
+
     class Meta:
         verbose_name = "Exporting Company"
         verbose_name_plural = "Exporting Companies"
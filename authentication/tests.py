@@ -1,3 +1,108 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from .forms import phone_number_error
+from .models import ShrimpFarmingCompany, ExportingCompany
+
+
+COMPANY_DATA = {
+    "company_name": "Test Shrimp Co",
+    "ceo_name": "Test CEO",
+    "location": "Bushehr",
+    "address": "Test address",
+    "phone_number": "09120000000",
+    "password": "s3cret-pass",
+}
+
+
+class PasswordHashingTests(TestCase):
+    """Passwords must never be stored in plain text."""
+
+    def test_register_hashes_password(self):
+        response = self.client.post(reverse("register"), {**COMPANY_DATA, "shrimp_submit": ""})
+
+        self.assertRedirects(response, reverse("register"), fetch_redirect_response=False)
+        company = ShrimpFarmingCompany.objects.get(phone_number=COMPANY_DATA["phone_number"])
+        self.assertNotEqual(company.password, COMPANY_DATA["password"])
+        self.assertTrue(check_password(COMPANY_DATA["password"], company.password))
+
+    def test_admin_save_hashes_password(self):
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "admin-pass")
+        self.client.force_login(admin_user)
+
+        response = self.client.post(
+            reverse("admin:authentication_exportingcompany_add"), COMPANY_DATA
+        )
+
+        self.assertEqual(response.status_code, 302)
+        company = ExportingCompany.objects.get(phone_number=COMPANY_DATA["phone_number"])
+        self.assertNotEqual(company.password, COMPANY_DATA["password"])
+        self.assertTrue(check_password(COMPANY_DATA["password"], company.password))
+
+    def test_migration_hashes_plaintext_rows(self):
+        migration = import_module("authentication.migrations.0004_hash_company_passwords")
+        plain = ShrimpFarmingCompany.objects.create(**{**COMPANY_DATA, "password": "plain-pass"})
+        hashed = ExportingCompany.objects.create(**{**COMPANY_DATA, "password": make_password("kept-pass")})
+        original_hash = hashed.password
+
+        migration.hash_plaintext_passwords(apps, None)
+
+        plain.refresh_from_db()
+        hashed.refresh_from_db()
+        self.assertTrue(check_password("plain-pass", plain.password))
+        # Rows that already hold a hash are left untouched
+        self.assertEqual(hashed.password, original_hash)
+
+
+class CompanyLoginViewTests(TestCase):
+    """Login checks the submitted password against the stored hash."""
+
+    def setUp(self):
+        self.company = ShrimpFarmingCompany.objects.create(
+            **{**COMPANY_DATA, "password": make_password(COMPANY_DATA["password"])}
+        )
+
+    def login(self, password):
+        return self.client.post(reverse("login"), {
+            "phone_number": COMPANY_DATA["phone_number"],
+            "password": password,
+            "login_type": "shrimp",
+        })
+
+    def test_correct_password_logs_in(self):
+        response = self.login(COMPANY_DATA["password"])
+
+        self.assertRedirects(response, reverse("shrimp_dashboard_info"), fetch_redirect_response=False)
+        self.assertEqual(self.client.session["company_id"], self.company.id)
+        self.assertEqual(self.client.session["company_type"], "shrimp")
+
+    def test_wrong_password_is_rejected(self):
+        response = self.login("wrong-pass")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("company_id", self.client.session)
+
+
+class PhoneNumberErrorTests(TestCase):
+    """Dashboard profile edits validate the new phone before saving it."""
+
+    def setUp(self):
+        self.company = ShrimpFarmingCompany.objects.create(**COMPANY_DATA)
+
+    def test_accepts_own_and_free_numbers(self):
+        self.assertIsNone(phone_number_error(self.company, COMPANY_DATA["phone_number"]))
+        self.assertIsNone(phone_number_error(self.company, "0912 111 2222"))
+
+    def test_rejects_malformed_and_overlong_numbers(self):
+        self.assertIsNotNone(phone_number_error(self.company, "0912-abc-2222"))
+        self.assertIsNotNone(phone_number_error(self.company, "0912 888 8888 8888 8888"))
+
+    def test_rejects_number_of_another_company(self):
+        ShrimpFarmingCompany.objects.create(**{**COMPANY_DATA, "phone_number": "09121112222"})
 
-# Create your tests here.
+        self.assertIsNotNone(phone_number_error(self.company, "09121112222"))
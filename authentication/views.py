@@ -2,6 +2,7 @@ from django.views import View
 from django.shortcuts import render, redirect
 from django.http import HttpResponse
 from django.contrib import messages
+from django.contrib.auth.hashers import check_password
 from .forms import ShrimpFarmingCompanyForm, ExportingCompanyForm
 from .models import ShrimpFarmingCompany, ExportingCompany
 
@@ -27,6 +28,20 @@ class CompanyRegisterView(View):
 
     template_name = "auth/register.html"
 
+    # Submit button name -> (form class, success message, template context key)
+    FORM_MAP = {
+        "shrimp_submit": (
+            ShrimpFarmingCompanyForm,
+            "شرکت پرورش میگو با موفقیت ثبت شد",
+            "shrimp_form",
+        ),
+        "export_submit": (
+            ExportingCompanyForm,
+            "شرکت صادرکننده میگو با موفقیت ثبت شد",
+            "export_form",
+        ),
+    }
+
     def get(self, request):
         """Render the registration page with fresh forms."""
         return render(request, self.template_name)
@@ -39,44 +54,34 @@ class CompanyRegisterView(View):
             - 'shrimp_submit' → ShrimpFarmingCompanyForm
             - 'export_submit'  → ExportingCompanyForm
         """
-        # Handle Shrimp Farming Company Registration
-        if "shrimp_submit" in request.POST:
-            form = ShrimpFarmingCompanyForm(request.POST, request.FILES)
-            if form.is_valid():
-                form.save()
-                messages.success(request, "شرکت پرورش میگو با موفقیت ثبت شد")
-                return redirect("register")
-            else:
-                messages.error(request, "خطا در ثبت اطلاعات. لطفاً موارد را بررسی کنید.")
-                return render(request, self.template_name, {"shrimp_form": form})
-
-        # Handle Exporting Company Registration
-        elif "export_submit" in request.POST:
-            form = ExportingCompanyForm(request.POST, request.FILES)
-            if form.is_valid():
-                form.save()
-                messages.success(request, "شرکت صادرکننده میگو با موفقیت ثبت شد")
-                return redirect("register")
-            else:
-                messages.error(request, "خطا در ثبت اطلاعات. لطفاً موارد را بررسی کنید.")
-                return render(request, self.template_name, {"export_form": form})
+        submit_key = next((key for key in self.FORM_MAP if key in request.POST), None)
 
         # No valid submission detected
-        messages.error(request, "هیچ فرمی ارسال نشده است")
-        return redirect("register")
+        if submit_key is None:
+            messages.error(request, "هیچ فرمی ارسال نشده است")
+            return redirect("register")
+
+        form_class, success_message, context_key = self.FORM_MAP[submit_key]
+        form = form_class(request.POST, request.FILES, use_required_attribute=False)
+        if form.is_valid():
+            form.save()
+            messages.success(request, success_message)
+            return redirect("register")
+
+        messages.error(request, "خطا در ثبت اطلاعات. لطفاً موارد را بررسی کنید.")
+        return render(request, self.template_name, {context_key: form})
 
 
 # =============================================================================
 # COMPANY LOGIN VIEW
 # Secure authentication for two types of companies using phone & password.
 # Stores session data upon successful login for dashboard personalization.
-# 
-# WARNING: Plain-text password check is insecure. Future upgrade recommended.
+# Passwords are stored hashed and verified with check_password().
 # =============================================================================
 
 class CompanyLoginView(View):
     """
-    Authenticate companies based on phone number and plain password.
+    Authenticate companies based on phone number and hashed password.
     
     Supports two user types:
         - 'shrimp': Redirects to shrimp_dashboard_info
@@ -106,15 +111,13 @@ class CompanyLoginView(View):
         password = request.POST.get("password")
         login_type = request.POST.get("login_type")
 
-        # Debug logging (remove in production)
-        print(f"Login Attempt - Phone: {phone_number}, Type: {login_type}")
-
         # Try logging in as Shrimp Farming Company
         if login_type == "shrimp":
-            company = ShrimpFarmingCompany.objects.filter(
-                phone_number=phone_number, password=password
-            ).first()
-            if company:
+            company = ShrimpFarmingCompany.objects.only(
+                "id", "company_name", "password"
+            ).filter(phone_number=phone_number).first()
+            if company and check_password(password, company.password):
+                request.session.cycle_key()
                 request.session["company_id"] = company.id
                 request.session["company_type"] = "shrimp"
                 request.session["company_name"] = company.company_name
@@ -122,18 +125,15 @@ class CompanyLoginView(View):
 
         # Try logging in as Exporting Company
         elif login_type == "export":
-            company = ExportingCompany.objects.filter(
-                phone_number=phone_number, password=password
-            ).first()
-            if company:
+            company = ExportingCompany.objects.only(
+                "id", "company_name", "password"
+            ).filter(phone_number=phone_number).first()
+            if company and check_password(password, company.password):
+                request.session.cycle_key()
                 request.session["company_id"] = company.id
                 request.session["company_type"] = "export"
                 request.session["company_name"] = company.company_name
                 return redirect("export_dashboard_info")
 
         # Authentication failed
-        print("Failed login attempt with credentials:", phone_number, password)
-        print("All Shrimp Companies:", list(ShrimpFarmingCompany.objects.values_list("phone_number", "password")))
-        print("All Export Companies:", list(ExportingCompany.objects.values_list("phone_number", "password")))
-
         return HttpResponse("شماره تلفن یا رمز عبور اشتباه است")
\ No newline at end of file
@@ -136,6 +136,17 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 
+# Used by the view-level caches. Local memory is per process; point this at
+# Redis or Memcached when more than one worker serves the site.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Sessions stay in the database: with a per-process cache, a cached session
+# flushed on logout would remain valid in the other workers. Switch to
+# 'django.contrib.sessions.backends.cached_db' once CACHES is shared.
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_NAME = 'companysessionid'
 
@@ -1,15 +1,157 @@
+from functools import lru_cache
+
 from django.contrib import admin
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Prefetch
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
 # Import models from respective apps
+from authentication.admin_mixins import ChangelistAdminMixin
 from authentication.models import ShrimpFarmingCompany, ExportingCompany
 from shrimp_panel.models import ShrimpProduct
-from .models import ProductPackage
+from .models import QR_PARALLEL_THRESHOLD, ProductPackage, render_qr_pngs
+
+
+# -----------------------------------------------------------------------------
+# Detail Table Rendering
+# The read-only detail tables only depend on the values they display, so the
+# rendered HTML is memoized on those values. A changed product or company
+# produces a new cache key, so entries never go stale.
+# -----------------------------------------------------------------------------
+
+@lru_cache(maxsize=1024)
+def _render_product_details(product_name, shrimp_type, weight, price, support_code, package_weight):
+    """Build the product details table for the given field values."""
+    return f"""
+    <div style="font-family: system-ui, sans-serif;">
+        <table style="width:100%; border-collapse: collapse; margin: 10px 0;">
+            <thead>
+                <tr style="background-color: #f8f9fa;">
+                    <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Field</th>
+                    <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Value</th>
+                </tr>
+            </thead>
+            <tbody>
+                <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Product Name</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{product_name}</td></tr>
+                <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Shrimp Type</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{shrimp_type}</td></tr>
+                <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Total Weight</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{weight} Kg</td></tr>
+                <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Price</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{price}</td></tr>
+                <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Support Code</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{support_code}</td></tr>
+                <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Package Weight</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{package_weight} Kg</td></tr>
+            </tbody>
+        </table>
+    </div>
+    """
+
+
+@lru_cache(maxsize=1024)
+def _render_company_details(farming, exporting):
+    """
+    Build the company details table.
+    Each argument is a (company_name, ceo_name, location, phone_number) tuple.
+    """
+    farming_name, farming_ceo, farming_location, farming_phone = farming
+    exporting_name, exporting_ceo, exporting_location, exporting_phone = exporting
+    return f"""
+    <div style="font-family: system-ui, sans-serif;">
+        <table style="width:100%; border-collapse: collapse; margin: 10px 0;">
+            <thead>
+                <tr style="background-color: #f8f9fa;">
+                    <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Company</th>
+                    <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Details</th>
+                </tr>
+            </thead>
+            <tbody>
+                <tr>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right; vertical-align: top;">Farming</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">
+                        <strong>{farming_name}</strong><br>
+                        CEO: {farming_ceo}<br>
+                        Location: {farming_location}<br>
+                        Phone: {farming_phone}
+                    </td>
+                </tr>
+                <tr>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right; vertical-align: top;">Exporting</td>
+                    <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">
+                        <strong>{exporting_name}</strong><br>
+                        CEO: {exporting_ceo}<br>
+                        Location: {exporting_location}<br>
+                        Phone: {exporting_phone}
+                    </td>
+                </tr>
+            </tbody>
+        </table>
+    </div>
+    """
+
+
+def _company_summary(company):
+    """Hashable tuple of the company fields shown in the details table."""
+    return (company.company_name, company.ceo_name, company.location, company.phone_number)
+
+
+# -----------------------------------------------------------------------------
+# Sidebar Filters
+# Company filters list only the busiest companies, cached for a few minutes,
+# instead of rendering every company row on each changelist load.
+# -----------------------------------------------------------------------------
+
+class TopCompanyListFilter(admin.SimpleListFilter):
+    """
+    Base filter offering the companies with the most product packages.
+    Subclasses set the company model and the package foreign key parameter.
+    """
+
+    company_model = None
+    limit = 20
+    cache_timeout = 300
+
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            f'product_package_filter:{self.parameter_name}',
+            self.top_companies,
+            timeout=self.cache_timeout,
+        )
+
+    def top_companies(self):
+        """Return (id, name) pairs of the companies with the most packages."""
+        return list(
+            self.company_model.objects
+            .annotate(package_count=Count('productpackage'))
+            .filter(package_count__gt=0)
+            .order_by('-package_count')
+            .values_list('id', 'company_name')[:self.limit]
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+
+
+class FarmingCompanyListFilter(TopCompanyListFilter):
+    title = 'Farming Company'
+    parameter_name = 'farming_company__id__exact'
+    company_model = ShrimpFarmingCompany
+
+
+class ExportingCompanyListFilter(TopCompanyListFilter):
+    title = 'Exporting Company'
+    parameter_name = 'exporting_company__id__exact'
+    company_model = ExportingCompany
 
 
 @admin.register(ProductPackage)
-class ProductPackageAdmin(admin.ModelAdmin):
+class ProductPackageAdmin(ChangelistAdminMixin, admin.ModelAdmin):
     """
     Admin interface for ProductPackage model.
     
@@ -37,8 +179,8 @@ class ProductPackageAdmin(admin.ModelAdmin):
     list_filter = [
         'production_date',
         'expiration_date',
-        'farming_company',
-        'exporting_company',
+        FarmingCompanyListFilter,
+        ExportingCompanyListFilter,
         'shrimp_product__shrimp_type',
         'created_at',
     ]
@@ -112,11 +254,41 @@ class ProductPackageAdmin(admin.ModelAdmin):
         """
         Optimize database queries by prefetching related objects.
         Prevents N+1 query problem when displaying list or detail views.
+
+        The changelist prefetches narrowed related rows in separate queries:
+        the same product or company repeats across many packages, and a JOIN
+        would ship its wide columns (address, logo, password) once per package.
+        The change form loads complete related rows with a single JOIN.
         """
-        return super().get_queryset(request).select_related(
+        queryset = super().get_queryset(request)
+        if not self._is_changelist(request):
+            return queryset.select_related(
+                'shrimp_product',
+                'farming_company',
+                'exporting_company'
+            )
+
+        return queryset.only(
+            'batch_number',
             'shrimp_product',
             'farming_company',
-            'exporting_company'
+            'exporting_company',
+            'package_weight',
+            'quantity',
+            'production_date',
+            'expiration_date',
+            'qr_code',
+            'created_at',
+        ).prefetch_related(
+            Prefetch('shrimp_product', queryset=ShrimpProduct.objects.only(
+                'id', 'product_name', 'shrimp_type', 'weight'
+            )),
+            Prefetch('farming_company', queryset=ShrimpFarmingCompany.objects.only(
+                'id', 'company_name', 'ceo_name', 'location', 'phone_number'
+            )),
+            Prefetch('exporting_company', queryset=ExportingCompany.objects.only(
+                'id', 'company_name', 'ceo_name', 'location', 'phone_number'
+            )),
         )
 
     # -------------------------------------------------------------------------
@@ -187,70 +359,23 @@ class ProductPackageAdmin(admin.ModelAdmin):
 
     def product_details(self, obj):
         """Render a styled table with full product information."""
-        details = f"""
-        <div style="font-family: system-ui, sans-serif;">
-            <table style="width:100%; border-collapse: collapse; margin: 10px 0;">
-                <thead>
-                    <tr style="background-color: #f8f9fa;">
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Field</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Value</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Product Name</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{obj.shrimp_product.product_name}</td></tr>
-                    <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Shrimp Type</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{obj.shrimp_product.shrimp_type}</td></tr>
-                    <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Total Weight</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{obj.shrimp_product.weight} Kg</td></tr>
-                    <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Price</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{obj.shrimp_product.price}</td></tr>
-                    <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Support Code</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{obj.shrimp_product.support_code}</td></tr>
-                    <tr><td style="border: 1px solid #ddd; padding: 8px; text-align: right;">Package Weight</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">{obj.package_weight} Kg</td></tr>
-                </tbody>
-            </table>
-        </div>
-        """
-        return mark_safe(details)
+        product = obj.shrimp_product
+        return mark_safe(_render_product_details(
+            product.product_name,
+            product.shrimp_type,
+            product.weight,
+            product.price,
+            product.support_code,
+            obj.package_weight,
+        ))
     product_details.short_description = 'Product Details'
 
     def company_details(self, obj):
         """Render a styled table with farming and exporting company information."""
-        details = f"""
-        <div style="font-family: system-ui, sans-serif;">
-            <table style="width:100%; border-collapse: collapse; margin: 10px 0;">
-                <thead>
-                    <tr style="background-color: #f8f9fa;">
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Company</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: right; font-weight: bold;">Details</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right; vertical-align: top;">Farming</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">
-                            <strong>{obj.farming_company.company_name}</strong><br>
-                            CEO: {obj.farming_company.ceo_name}<br>
-                            Location: {obj.farming_company.location}<br>
-                            Phone: {obj.farming_company.phone_number}
-                        </td>
-                    </tr>
-                    <tr>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right; vertical-align: top;">Exporting</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: right;">
-                            <strong>{obj.exporting_company.company_name}</strong><br>
-                            CEO: {obj.exporting_company.ceo_name}<br>
-                            Location: {obj.exporting_company.location}<br>
-                            Phone: {obj.exporting_company.phone_number}
-                        </td>
-                    </tr>
-                </tbody>
-            </table>
-        </div>
-        """
-        return mark_safe(details)
+        return mark_safe(_render_company_details(
+            _company_summary(obj.farming_company),
+            _company_summary(obj.exporting_company),
+        ))
     company_details.short_description = 'Company Details'
 
     # -------------------------------------------------------------------------
@@ -260,14 +385,44 @@ class ProductPackageAdmin(admin.ModelAdmin):
 
     actions = ['generate_qr_codes']
 
+    # Selections at least this large render QR images in a process pool
+    qr_parallel_threshold = QR_PARALLEL_THRESHOLD
+
     def generate_qr_codes(self, request, queryset):
         """
         Action to generate QR codes for selected product packages.
-        Calls the model's generate_qr_code() method for each item.
+        Renders every image first, then stores all new paths with a single
+        bulk_update() instead of one UPDATE per package.
         """
-        updated_count = 0
-        for package in queryset:
-            package.generate_qr_code()
-            updated_count += 1
-        self.message_user(request, f"QR codes generated for {updated_count} package(s).")
+        packages = list(
+            queryset.prefetch_related(None).select_related(
+                'shrimp_product',
+                'farming_company',
+                'exporting_company'
+            ).only(
+                'batch_number',
+                'package_weight',
+                'quantity',
+                'production_date',
+                'expiration_date',
+                'qr_code',
+                'shrimp_product__product_name',
+                'shrimp_product__shrimp_type',
+                'shrimp_product__support_code',
+                'farming_company__company_name',
+                'exporting_company__company_name',
+            )
+        )
+
+        images = render_qr_pngs(
+            [package.qr_payload() for package in packages],
+            parallel_threshold=self.qr_parallel_threshold
+        )
+        for package, image in zip(packages, images):
+            package.build_qr_code(image)
+
+        with transaction.atomic():
+            ProductPackage.objects.bulk_update(packages, ['qr_code'], batch_size=500)
+
+        self.message_user(request, f"QR codes generated for {len(packages)} package(s).")
     generate_qr_codes.short_description = "Generate QR Codes for Selected Packages"
@@ -1,6 +1,12 @@
+import re
+
 from django import forms
 
 
+# Matches runs of non-digits (Unicode-aware, so Persian digits are kept)
+_NON_DIGIT = re.compile(r'\D+')
+
+
 class CompanyEditForm(forms.Form):
     """
     Form for editing company profile information.
@@ -68,7 +74,7 @@ class CompanyEditForm(forms.Form):
         """
         phone = self.cleaned_data.get('phone')
         if phone:
-            cleaned_number = ''.join(filter(str.isdigit, phone))
+            cleaned_number = _NON_DIGIT.sub('', phone)
             if len(cleaned_number) < 10:
                 raise forms.ValidationError('شماره تلفن باید حداقل 10 رقم داشته باشد.')
         return phone
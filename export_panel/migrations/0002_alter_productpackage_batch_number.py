@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:09
+
+import export_panel.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('export_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='productpackage',
+            name='batch_number',
+            field=models.CharField(default=export_panel.models.default_batch_number, max_length=100, unique=True, verbose_name='Batch Number'),
+        ),
+    ]
@@ -1,15 +1,31 @@
+import hashlib
 import os
-import qrcode
-import uuid
-from io import BytesIO
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.db import models
 from django.utils import timezone
 from decimal import Decimal
 from authentication.models import ShrimpFarmingCompany, ExportingCompany
 from shrimp_panel.models import ShrimpProduct
+from .qr import render_qr_png
 
 
+# QR images regenerated from the admin are cached for an hour, keyed by a
+# hash of the payload; new packages always render fresh (unique batch number)
+QR_PNG_CACHE_TIMEOUT = 60 * 60
+
+# Batches with at least this many uncached QR codes render in a process pool
+QR_PARALLEL_THRESHOLD = 50
+
+# Packages expire this long after their production date
+SHELF_LIFE = timedelta(days=365)
+
+# Crockford base32, as used by ULIDs (no I, L, O or U)
+ULID_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
 def qr_code_path(instance, filename):
     """
     Define upload path for QR code images.
@@ -17,11 +33,57 @@ def qr_code_path(instance, filename):
     """
     return os.path.join("qrcodes", f"{instance.batch_number}_{filename}")
 
+def qr_png_cache_key(qr_data):
+    """
+    Cache key for the rendered PNG of a QR payload.
+    Example: 'qr_png:9f86d081884c7d65...'
+    """
+    return f"qr_png:{hashlib.sha256(qr_data.encode()).hexdigest()}"
+
+def render_qr_pngs(payloads, parallel_threshold=QR_PARALLEL_THRESHOLD):
+    """
+    Return PNG bytes for many QR payloads, in the same order.
+    Cached images are fetched with one get_many(); misses are rendered in a
+    process pool when there are at least `parallel_threshold` of them.
+    """
+    keys = [qr_png_cache_key(payload) for payload in payloads]
+    images = cache.get_many(keys)
+    missing = {
+        key: payload for key, payload in zip(keys, payloads) if key not in images
+    }
+
+    # QR encoding is CPU-bound pure Python; spread large batches over
+    # worker processes and keep small ones in-process to skip pool startup
+    if len(missing) >= parallel_threshold:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            rendered = executor.map(render_qr_png, missing.values(), chunksize=8)
+            rendered = dict(zip(missing, rendered))
+    else:
+        rendered = {key: render_qr_png(payload) for key, payload in missing.items()}
+    cache.set_many(rendered, QR_PNG_CACHE_TIMEOUT)
+    images.update(rendered)
+
+    return [images[key] for key in keys]
+
+def default_batch_number():
+    """
+    Default batch number = 'BATCH-' + a 26-character ULID.
+    The millisecond timestamp leads, so new numbers sort after older ones
+    and land at the right edge of the unique index instead of at random.
+    Example: 'BATCH-01J9ZQ3K8W6T4M2XN7R5VB0CDE'
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(ULID_ALPHABET[index])
+    return f"BATCH-{''.join(reversed(chars))}"
+
 def default_expiration_date():
     """
     Default expiration date = today + 365 days
     """
-    return timezone.now().date() + timezone.timedelta(days=365)
+    return timezone.now().date() + SHELF_LIFE
 
 
 class ProductPackage(models.Model):
@@ -72,6 +134,7 @@ class ProductPackage(models.Model):
     batch_number = models.CharField(
         max_length=100,
         unique=True,
+        default=default_batch_number,
         verbose_name="Batch Number"
     )
     qr_code = models.ImageField(
@@ -99,28 +162,53 @@ class ProductPackage(models.Model):
             - QR code (if not already generated)
         """
         if not self.batch_number:
-            self.batch_number = f"BATCH-{uuid.uuid4().hex[:10].upper()}"
+            self.batch_number = default_batch_number()
 
         if not self.production_date:
             self.production_date = timezone.now().date()
 
         if not self.expiration_date:
-            self.expiration_date = self.production_date + timezone.timedelta(days=365)
+            self.expiration_date = self.production_date + SHELF_LIFE
 
-        super().save(*args, **kwargs)
-
-        # Generate QR code only if it doesn't exist
+        # Attach the QR code before the write so creation is a single INSERT;
+        # packages that already have one keep it on later updates
         if not self.qr_code:
-            self.generate_qr_code()
+            self.build_qr_code()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'qr_code'}
+
+        super().save(*args, **kwargs)
 
     def generate_qr_code(self):
         """
         Generate a QR code containing full traceability information about this package.
-        The QR code is saved to the filesystem and linked to the model instance.
+        Returns the PNG as an unsaved ContentFile ready to assign to qr_code.
+        """
+        return ContentFile(render_qr_png(self.qr_payload()))
+
+    def build_qr_code(self, image=None):
         """
+        Render the QR code image and attach it to the qr_code field.
+        Writes the image file to storage but does not touch the database,
+        so callers can persist many packages at once with bulk_update().
+        Pass pre-rendered PNG bytes as `image` to skip rendering here.
+        """
+        content = self.generate_qr_code() if image is None else ContentFile(image)
+        filename = f"qr_code_{self.batch_number}.png"
+
+        # Save image to FileField
+        self.qr_code.save(
+            name=filename,
+            content=content,
+            save=False  # Prevent infinite loop
+        )
+
+    def qr_payload(self):
+        """Build the traceability text encoded in this package's QR code."""
         total_weight = self.package_weight * self.quantity
 
-        qr_data = f"""
+        return f"""
         اطلاعات بسته محصول:
         شماره بچ: {self.batch_number}
         محصول: {self.shrimp_product.product_name}
@@ -134,28 +222,3 @@ class ProductPackage(models.Model):
         تاریخ انقضا: {self.expiration_date}
         کد پشتیبانی: {self.shrimp_product.support_code}
         """.strip()
-
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        filename = f"qr_code_{self.batch_number}.png"
-
-        # Save image to FileField
-        self.qr_code.save(
-            name=filename,
-            content=ContentFile(buffer.getvalue()),
-            save=False  # Prevent infinite loop
-        )
-
-        # Final save without triggering QR generation again
-        super(ProductPackage, self).save(update_fields=['qr_code'])
\ No newline at end of file
@@ -1,3 +1,159 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from authentication.models import ShrimpFarmingCompany, ExportingCompany
+from shrimp_panel.models import RequestsProduct, ShrimpProduct
+from . import views
+from .admin import ProductPackageAdmin
+from .models import ProductPackage
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def create_company(model, phone_number):
+    return model.objects.create(
+        company_name=f"Company {phone_number}",
+        ceo_name="CEO",
+        location="Bushehr",
+        address="Address",
+        phone_number=phone_number,
+        password="unused",
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ExportPanelTestCase(TestCase):
+    """A farm with one product and an exporter; QR files go to a temp dir."""
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.farm = create_company(ShrimpFarmingCompany, "09120000001")
+        self.exporter = create_company(ExportingCompany, "09120000002")
+        self.product = ShrimpProduct.objects.create(
+            company=self.farm, product_name="Vannamei", weight=100, shrimp_type="white", price=1000
+        )
+
+    def create_package(self):
+        return ProductPackage.objects.create(
+            shrimp_product=self.product,
+            farming_company=self.farm,
+            exporting_company=self.exporter,
+            package_weight=10,
+            quantity=2,
+        )
+
+
+class GenerateQrCodesActionTests(ExportPanelTestCase):
+
+    def test_parallel_generation_stores_new_images(self):
+        packages = [self.create_package() for _ in range(3)]
+        old_names = {package.pk: package.qr_code.name for package in packages}
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "admin-pass"))
+
+        # A threshold of 1 sends every selection through the process pool
+        with mock.patch.object(ProductPackageAdmin, "qr_parallel_threshold", 1):
+            response = self.client.post(reverse("admin:export_panel_productpackage_changelist"), {
+                "action": "generate_qr_codes",
+                "_selected_action": list(old_names),
+            })
+
+        self.assertEqual(response.status_code, 302)
+        for package in ProductPackage.objects.all():
+            self.assertNotEqual(package.qr_code.name, old_names[package.pk])
+            self.assertTrue(package.qr_code.storage.exists(package.qr_code.name))
+
+
+class CreatePackageViewTests(ExportPanelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        RequestsProduct.objects.create(
+            support_code=self.product.support_code,
+            buyer_company=self.exporter,
+            product=self.product,
+            owner_company=self.farm,
+            status="approved",
+        )
+        session = self.client.session
+        session["company_id"] = self.exporter.id
+        session["company_type"] = "export"
+        session.save()
+
+    def create(self, product=None, package_weight="10", package_count="2"):
+        return self.client.post(reverse("export_dashboard_create_product_package"), {
+            "shrimp_product": (product or self.product).id,
+            "package_weight": package_weight,
+            "package_count": package_count,
+        })
+
+    def stored_qr_files(self):
+        qr_dir = os.path.join(MEDIA_ROOT, "qrcodes")
+        return set(os.listdir(qr_dir)) if os.path.isdir(qr_dir) else set()
+
+    def assertNothingCreated(self, weight=Decimal("100")):
+        self.assertFalse(ProductPackage.objects.exists())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.weight, weight)
+
+    def test_creates_package_and_deducts_stock(self):
+        files_before = self.stored_qr_files()
+
+        response = self.create()
+
+        self.assertEqual(response.status_code, 200)
+        package = ProductPackage.objects.get()
+        self.assertEqual(package.quantity, 2)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.weight, Decimal("80"))
+        self.assertEqual(self.stored_qr_files() - files_before, {os.path.basename(package.qr_code.name)})
+
+    def test_product_without_approved_request_is_rejected(self):
+        other_product = ShrimpProduct.objects.create(
+            company=self.farm, product_name="Other", weight=100, shrimp_type="white", price=1000
+        )
+
+        response = self.create(product=other_product)
+
+        self.assertRedirects(response, reverse("export_dashboard_create_product_package"),
+                             fetch_redirect_response=False)
+        self.assertFalse(ProductPackage.objects.exists())
+        other_product.refresh_from_db()
+        self.assertEqual(other_product.weight, Decimal("100"))
+
+    def test_lost_stock_race_creates_nothing(self):
+        files_before = self.stored_qr_files()
+        render_qr_png = views.render_qr_png
+
+        def render_while_stock_is_taken(payload):
+            # Another request takes the stock after this one has checked it
+            ShrimpProduct.objects.filter(pk=self.product.pk).update(weight=5)
+            return render_qr_png(payload)
+
+        with mock.patch.object(views, "render_qr_png", render_while_stock_is_taken):
+            response = self.create()
+
+        self.assertRedirects(response, reverse("export_dashboard_create_product_package"),
+                             fetch_redirect_response=False)
+        self.assertNothingCreated(weight=Decimal("5"))
+        self.assertEqual(self.stored_qr_files(), files_before)
+
+    def test_invalid_input_is_rejected(self):
+        for package_weight, package_count in [("abc", "2"), ("0.001", "2"), ("10", "1.5"), ("0", "2")]:
+            with self.subTest(package_weight=package_weight, package_count=package_count):
+                response = self.create(package_weight=package_weight, package_count=package_count)
+
+                self.assertRedirects(response, reverse("export_dashboard_create_product_package"),
+                                     fetch_redirect_response=False)
+                self.assertNothingCreated()
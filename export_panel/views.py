@@ -1,43 +1,101 @@
+import re
+
 from django.views import View
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Exists, F, OuterRef
 from django.utils import timezone
 from decimal import Decimal
+from authentication.forms import phone_number_error
 from authentication.models import ExportingCompany
-from shrimp_panel.models import ShrimpProduct, RequestsProduct
-from .models import ProductPackage
+from shrimp_panel.models import RequestsProduct, ShrimpProduct, requests_list_cache_key
+from .models import SHELF_LIFE, ProductPackage, render_qr_png
 from .forms import CompanyEditForm
 from django.conf import settings
 
 
+# Placeholder shown on the dashboard when the company has no logo
+DEFAULT_LOGO_URL = f"{settings.STATIC_URL}Static Home/images/logo-sample-2.png"
+
+
 # =============================================================================
-# EXPORT DASHBOARD: COMPANY PROFILE MANAGEMENT
-# Handles viewing and editing company information for exporting companies.
+# INPUT PARSING HELPERS
+# Validate numeric form input with patterns instead of catching exceptions.
 # =============================================================================
 
-class ExportDashboardView(View):
+_INT_PATTERN = re.compile(r'^\s*[+-]?\d+\s*$')
+
+# Decimals must fit package_weight (max_digits=8, decimal_places=2), so input
+# is never silently rounded while the full amount is deducted from stock
+_DECIMAL_PATTERN = re.compile(r'^\s*[+-]?(\d{1,6}(\.\d{0,2})?|\.\d{1,2})\s*$')
+
+
+def _parse_int(value):
+    """Return value as an int, or None if it is not a whole number."""
+    if value is None or not _INT_PATTERN.match(value):
+        return None
+    return int(value)
+
+
+def _parse_decimal(value):
     """
-    Display and edit profile information for the logged-in exporting company.
-    Retrieves data from session and populates form with current details.
+    Return value as a Decimal, or None if it is not a plain number that fits
+    the package_weight column.
     """
+    if value is None or not _DECIMAL_PATTERN.match(value):
+        return None
+    return Decimal(value.strip())
 
-    template_name = "admin/Export Panel/Compnay Info.html"
+
+# =============================================================================
+# SESSION HELPERS
+# Shared lookup of the logged-in exporting company.
+# =============================================================================
+
+class ExportCompanySessionMixin:
+    """
+    Resolve the exporting company stored in the session.
+    The lookup runs at most once per request and loads only profile columns.
+    """
+
+    company_fields = (
+        'id', 'company_name', 'ceo_name', 'location',
+        'phone_number', 'address', 'logo', 'updated_at',
+    )
 
     def get_company_from_session(self, request):
         """
         Retrieve exporting company instance from session.
         Returns None if not authenticated or invalid type.
         """
+        if hasattr(self, '_company'):
+            return self._company
+
+        self._company = None
         company_id = request.session.get('company_id')
         company_type = request.session.get('company_type')
 
         if company_id and company_type == 'export':
-            try:
-                return ExportingCompany.objects.get(id=company_id)
-            except ExportingCompany.DoesNotExist:
-                return None
-        return None
+            self._company = ExportingCompany.objects.only(*self.company_fields).filter(
+                id=company_id
+            ).first()
+        return self._company
+
+
+# =============================================================================
+# EXPORT DASHBOARD: COMPANY PROFILE MANAGEMENT
+# Handles viewing and editing company information for exporting companies.
+# =============================================================================
+
+class ExportDashboardView(ExportCompanySessionMixin, View):
+    """
+    Display and edit profile information for the logged-in exporting company.
+    Retrieves data from session and populates form with current details.
+    """
+
+    template_name = "admin/Export Panel/Compnay Info.html"
 
     def get(self, request):
         """Render company info page with pre-filled edit form."""
@@ -55,12 +113,10 @@ class ExportDashboardView(View):
         }
         company_form = CompanyEditForm(initial=initial_data)
 
-        default_logo_url = f"{settings.STATIC_URL}Static Home/images/logo-sample-2.png"
-
         return render(request, self.template_name, {
             'company': company,
             'company_form': company_form,
-            'default_logo_url': default_logo_url,
+            'default_logo_url': DEFAULT_LOGO_URL,
         })
 
     def post(self, request):
@@ -71,16 +127,27 @@ class ExportDashboardView(View):
             return redirect('login')
 
         if 'edit_company' in request.POST:
+            phone = request.POST.get('phone', '').strip()
+            error = phone_number_error(company, phone)
+            if error:
+                messages.error(request, error)
+                return redirect('export_dashboard_info')
+
             company.company_name = request.POST.get('name', '')
             company.ceo_name = request.POST.get('manager_name', '')
             company.location = request.POST.get('city', '')
-            company.phone_number = request.POST.get('phone', '')
+            company.phone_number = phone
             company.address = request.POST.get('address', '')
+            changed_fields = [
+                'company_name', 'ceo_name', 'location', 'phone_number', 'address', 'updated_at'
+            ]
 
             if 'logo' in request.FILES:
                 company.logo = request.FILES['logo']
+                changed_fields.append('logo')
 
-            company.save()
+            # Write only the edited columns (updated_at keeps auto_now working)
+            company.save(update_fields=changed_fields)
             messages.success(request, "اطلاعات شرکت با موفقیت ویرایش شد.")
 
         return redirect('export_dashboard_info')
@@ -91,7 +158,7 @@ class ExportDashboardView(View):
 # Displays a list of approved product requests for the exporting company.
 # =============================================================================
 
-class ExporterPurchasedView(View):
+class ExporterPurchasedView(ExportCompanySessionMixin, View):
     """
     Show all approved product requests for the exporting company.
     Used to track purchased inventory before packaging.
@@ -101,19 +168,14 @@ class ExporterPurchasedView(View):
 
     def get(self, request):
         """Fetch and display approved product requests."""
-        company_id = request.session.get('company_id')
-        if not company_id:
-            return redirect('login')
-
-        try:
-            company = ExportingCompany.objects.get(id=company_id)
-        except ExportingCompany.DoesNotExist:
+        company = self.get_company_from_session(request)
+        if not company:
             return redirect('login')
 
         approved_requests = RequestsProduct.objects.filter(
             buyer_company=company,
             status='approved'
-        ).select_related('product', 'owner_company').order_by('-created_at')
+        ).select_related('product', 'owner_company').order_by('-operation_date')
 
         return render(request, self.template_name, {
             'approved_requests': approved_requests,
@@ -128,7 +190,7 @@ class ExporterPurchasedView(View):
 # Ensures stock availability and updates inventory atomically.
 # =============================================================================
 
-class CreatePackageView(View):
+class CreatePackageView(ExportCompanySessionMixin, View):
     """
     Handle creation of product packages from purchased shrimp products.
     
@@ -142,20 +204,17 @@ class CreatePackageView(View):
 
     template_name = 'admin/Export Panel/Company QR Code.html'
 
-    def get_company_from_session(self, request):
+    def get_purchased_products(self, company):
         """
-        Retrieve exporting company from session.
-        Centralized method used across multiple views.
+        Products the company has at least one approved request for.
+        Uses an EXISTS subquery instead of a JOIN + DISTINCT over requests.
         """
-        company_id = request.session.get('company_id')
-        company_type = request.session.get('company_type')
-
-        if company_id and company_type == 'export':
-            try:
-                return ExportingCompany.objects.get(id=company_id)
-            except ExportingCompany.DoesNotExist:
-                return None
-        return None
+        approved_requests = RequestsProduct.objects.filter(
+            product=OuterRef('pk'),
+            buyer_company=company,
+            status='approved'
+        )
+        return ShrimpProduct.objects.filter(Exists(approved_requests))
 
     def get(self, request):
         """Display available products for packaging."""
@@ -164,10 +223,7 @@ class CreatePackageView(View):
             messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
             return redirect('login')
 
-        purchased_products = ShrimpProduct.objects.filter(
-            requests__buyer_company=company,
-            requests__status='approved'
-        ).distinct()
+        purchased_products = self.get_purchased_products(company)
 
         return render(request, self.template_name, {
             'purchased_products': purchased_products,
@@ -187,15 +243,33 @@ class CreatePackageView(View):
             messages.error(request, "محصولی انتخاب نشده است.")
             return redirect('export_dashboard_create_product_package')
 
-        try:
-            package_weight = Decimal(request.POST.get('package_weight', '0'))
-            package_count = int(request.POST.get('package_count', '0'))
+        # Parse up front so malformed input is a None check, not an exception
+        product_id = _parse_int(shrimp_product_id)
+        package_weight = _parse_decimal(request.POST.get('package_weight', '0'))
+        package_count = _parse_int(request.POST.get('package_count', '0'))
+
+        if product_id is None or package_weight is None or package_count is None:
+            messages.error(request, "مقادیر وارد شده نامعتبر هستند.")
+            return redirect('export_dashboard_create_product_package')
 
+        try:
             if package_weight <= 0 or package_count <= 0:
                 messages.error(request, "وزن یا تعداد بسته‌ها باید بیشتر از صفر باشد.")
                 return redirect('export_dashboard_create_product_package')
 
-            shrimp_product = ShrimpProduct.objects.get(id=shrimp_product_id)
+            # Load the purchasable products once: the selected product comes from
+            # this list (with its farming company for the QR payload), and the
+            # same objects are rendered afterwards with their updated weight
+            purchased_products = list(
+                self.get_purchased_products(company).select_related('company')
+            )
+            shrimp_product = next(
+                (product for product in purchased_products if product.id == product_id),
+                None
+            )
+            if shrimp_product is None:
+                messages.error(request, "محصول انتخاب شده یافت نشد.")
+                return redirect('export_dashboard_create_product_package')
             total_weight_needed = package_weight * Decimal(package_count)
 
             if total_weight_needed > shrimp_product.weight:
@@ -207,30 +281,49 @@ class CreatePackageView(View):
 
             original_weight = shrimp_product.weight
 
+            production_date = timezone.now().date()
+            package = ProductPackage(
+                shrimp_product=shrimp_product,
+                farming_company=shrimp_product.company,
+                exporting_company=company,
+                package_weight=package_weight,
+                quantity=package_count,
+                production_date=production_date,
+                expiration_date=production_date + SHELF_LIFE,
+            )
+
+            # Render the QR code before opening the transaction so the
+            # write lock is only held for the INSERT and the stock update;
+            # the file is only stored once the stock has been reserved
+            qr_image = render_qr_png(package.qr_payload())
+
             with transaction.atomic():
-                # Create the package
-                package = ProductPackage.objects.create(
-                    shrimp_product=shrimp_product,
-                    farming_company=shrimp_product.company,
-                    exporting_company=company,
-                    package_weight=package_weight,
-                    quantity=package_count,
-                    production_date=timezone.now().date(),
-                    expiration_date=timezone.now().date() + timezone.timedelta(days=365),
+                # Deduct used weight in a single conditional UPDATE; no rows
+                # means another request consumed the stock since it was read
+                updated = ShrimpProduct.objects.filter(
+                    id=shrimp_product.id,
+                    weight__gte=total_weight_needed
+                ).update(weight=F('weight') - total_weight_needed)
+
+                if updated:
+                    # Create the package
+                    package.build_qr_code(qr_image)
+                    package.save()
+
+            shrimp_product.refresh_from_db(fields=['weight'])
+
+            if not updated:
+                messages.error(
+                    request,
+                    f"موجودی محصول کافی نیست. موجودی فعلی: {shrimp_product.weight} Kg"
                 )
+                return redirect('export_dashboard_create_product_package')
 
-                # Deduct used weight
-                shrimp_product.weight -= total_weight_needed
-                shrimp_product.save()
+            # The farm's request list shows the product's remaining weight
+            cache.delete(requests_list_cache_key(shrimp_product.company_id))
 
             remaining_weight = shrimp_product.weight
 
-            # Re-fetch updated product list
-            updated_products = ShrimpProduct.objects.filter(
-                requests__buyer_company=company,
-                requests__status='approved'
-            ).distinct()
-
             return render(request, self.template_name, {
                 'show_results': True,
                 'package': package,
@@ -239,14 +332,10 @@ class CreatePackageView(View):
                 'total_weight': total_weight_needed,
                 'original_weight': original_weight,
                 'remaining_weight': remaining_weight,
-                'purchased_products': updated_products,
+                'purchased_products': purchased_products,
                 'company_logo': company.logo.url if company.logo else None,
             })
 
-        except ShrimpProduct.DoesNotExist:
-            messages.error(request, "محصول انتخاب شده یافت نشد.")
-        except (ValueError, Decimal.InvalidOperation):
-            messages.error(request, "مقادیر وارد شده نامعتبر هستند.")
         except Exception as e:
             messages.error(request, f"خطا در ایجاد بسته‌ها: {str(e)}")
 
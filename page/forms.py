@@ -0,0 +1,23 @@
+from django import forms
+
+# Import models
+from .models import ContactMessage
+
+
+# =============================================================================
+# CONTACT FORM
+# Validates and cleans visitor submissions before they are stored.
+# =============================================================================
+
+class ContactMessageForm(forms.ModelForm):
+    """
+    Model form for the public contact page.
+
+    Field order matches the page, so the first error reported to the
+    visitor is the first problem on the form. Values are stripped and
+    validated (email format, max lengths) by the model fields.
+    """
+
+    class Meta:
+        model = ContactMessage
+        fields = ['name', 'email', 'subject', 'message', 'phone']
@@ -1,3 +1,41 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import ContactMessage
+
+
+CONTACT_DATA = {
+    "name": "Visitor",
+    "email": "visitor@example.com",
+    "subject": "Prices",
+    "message": "Do you export to Europe?",
+    "phone": "09120000000",
+}
+
+
+class ContactViewTests(TestCase):
+
+    def test_page_renders(self):
+        response = self.client.get(reverse("contact"))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_valid_message_is_stored_with_client_ip(self):
+        response = self.client.post(reverse("contact"), CONTACT_DATA, REMOTE_ADDR="10.0.0.7")
+
+        self.assertEqual(response.status_code, 200)
+        message = ContactMessage.objects.get()
+        self.assertEqual(message.email, CONTACT_DATA["email"])
+        self.assertEqual(message.ip_address, "10.0.0.7")
+        # The form is cleared after a successful submission
+        self.assertEqual(response.context["name"], "")
+
+    def test_invalid_message_is_not_stored(self):
+        for field, value in [("name", ""), ("email", "not-an-email")]:
+            with self.subTest(field=field):
+                response = self.client.post(reverse("contact"), {**CONTACT_DATA, field: value})
+
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(ContactMessage.objects.exists())
+                # The visitor's input is kept for correction
+                self.assertEqual(response.context["subject"], CONTACT_DATA["subject"])
@@ -3,12 +3,14 @@ from django.views import View
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
 from django.contrib.auth.decorators import login_required
 
 # Import models
 from authentication.models import ShrimpFarmingCompany, ExportingCompany
 from shrimp_panel.models import ShrimpProduct, RequestsProduct
-from .models import ContactMessage
+from .forms import ContactMessageForm
 
 
 # =============================================================================
@@ -28,8 +30,9 @@ class HomeView(TemplateView):
         context = super().get_context_data(**kwargs)
         session = self.request.session
 
-        context['is_logged_in'] = bool(session.get('company_type') and session.get('company_id'))
-        context['company_type'] = session.get('company_type')
+        company_type = session.get('company_type')
+        context['is_logged_in'] = bool(company_type and session.get('company_id'))
+        context['company_type'] = company_type
 
         return context
 
@@ -52,29 +55,33 @@ class ProductView(TemplateView):
         session = self.request.session
 
         # Fetch all products with related farming company (optimized)
-        context['products'] = ShrimpProduct.objects.select_related('company').all()
+        context['products'] = ShrimpProduct.objects.select_related('company').only(
+            'id', 'product_name', 'shrimp_type', 'weight', 'price', 'support_code',
+            'company__id', 'company__company_name'
+        )
 
         # Authentication context
-        is_logged_in = bool(session.get('company_type') and session.get('company_id'))
         company_type = session.get('company_type')
+        company_id = session.get('company_id')
+        is_logged_in = bool(company_type and company_id)
         context['is_logged_in'] = is_logged_in
         context['company_type'] = company_type
 
         # Track pending requests if user is an exporting company
+        buyer_company = None
         if is_logged_in and company_type == 'export':
-            try:
-                buyer_company = ExportingCompany.objects.get(id=session['company_id'])
-                pending_product_ids = RequestsProduct.objects.filter(
-                    buyer_company=buyer_company,
-                    status='pending'
-                ).values_list('product_id', flat=True)
-                context['pending_requests'] = list(pending_product_ids)
-                context['is_export_company'] = True
-            except ExportingCompany.DoesNotExist:
-                context['pending_requests'] = []
-                context['is_export_company'] = False
+            buyer_company = ExportingCompany.objects.only('id').filter(id=company_id).first()
+
+        if buyer_company is not None:
+            pending_product_ids = RequestsProduct.objects.filter(
+                buyer_company=buyer_company,
+                status='pending'
+            ).values_list('product_id', flat=True)
+            # A set keeps the template's `product.id in pending_requests` O(1)
+            context['pending_requests'] = set(pending_product_ids)
+            context['is_export_company'] = True
         else:
-            context['pending_requests'] = []
+            context['pending_requests'] = set()
             context['is_export_company'] = False
 
         return context
@@ -105,9 +112,8 @@ class RequestProductView(View):
             return redirect('product')
 
         # Validate exporter existence
-        try:
-            buyer_company = ExportingCompany.objects.get(id=company_id)
-        except ExportingCompany.DoesNotExist:
+        buyer_company = ExportingCompany.objects.only('id').filter(id=company_id).first()
+        if buyer_company is None:
             messages.error(request, 'شرکت صادرکننده یافت نشد.')
             return redirect('product')
 
@@ -145,32 +151,36 @@ class CompanyView(TemplateView):
         session = self.request.session
 
         context['companies'] = ShrimpFarmingCompany.objects.all()
-        context['is_logged_in'] = bool(session.get('company_type') and session.get('company_id'))
-        context['company_type'] = session.get('company_type')
+        company_type = session.get('company_type')
+        context['is_logged_in'] = bool(company_type and session.get('company_id'))
+        context['company_type'] = company_type
 
         return context
 
 
 # =============================================================================
 # ABOUT US VIEW
-# Static about page with same context structure as CompanyView.
+# Static about page with login context only.
 # =============================================================================
 
+@method_decorator(cache_page(60 * 5), name='dispatch')
+@method_decorator(vary_on_cookie, name='dispatch')
 class AboutView(TemplateView):
     """
-    Render the about us page with company list and login context.
-    Shares logic with CompanyView but uses different template.
+    Render the about us page with login context.
+    Cached for five minutes per cookie set, since only the login state varies.
     """
     template_name = 'page/About.html'
 
     def get_context_data(self, **kwargs):
-        """Reuse context logic from CompanyView."""
+        """Add authentication status and company type to context."""
         context = super().get_context_data(**kwargs)
         session = self.request.session
 
-        context['companies'] = ShrimpFarmingCompany.objects.all()
-        context['is_logged_in'] = bool(session.get('company_type') and session.get('company_id'))
-        context['company_type'] = session.get('company_type')
+        # The about page lists no companies, so only the login context is needed
+        company_type = session.get('company_type')
+        context['is_logged_in'] = bool(company_type and session.get('company_id'))
+        context['company_type'] = company_type
 
         return context
 
@@ -181,6 +191,17 @@ class AboutView(TemplateView):
 # Collects visitor info and stores message with IP address.
 # =============================================================================
 
+# Contact fields in page order, and their labels for error messages
+CONTACT_FIELDS = ('name', 'email', 'subject', 'message', 'phone')
+CONTACT_FIELD_LABELS = {
+    'name': 'نام',
+    'email': 'ایمیل',
+    'subject': 'موضوع',
+    'message': 'پیام',
+    'phone': 'شماره تلفن',
+}
+
+
 class ContactView(View):
     """
     Handle contact form display and submission.
@@ -189,7 +210,7 @@ class ContactView(View):
     POST: Validate input, save message, show success/error
     Stores client IP for spam monitoring.
     """
-    template_name = 'page/contact.html'
+    template_name = 'page/Contact.html'
 
     def get(self, request):
         """Render blank contact form."""
@@ -198,34 +219,29 @@ class ContactView(View):
     def post(self, request):
         """Process submitted contact form."""
         context = self._get_base_context()
-        data = {key: request.POST.get(key, '').strip() for key in ['name', 'email', 'subject', 'message', 'phone']}
+        form = ContactMessageForm(request.POST)
 
         # Repopulate form fields
-        context.update(data)
-
-        # Validation
-        required_fields = ['name', 'email', 'subject', 'message']
-        labels = {'name': 'نام', 'email': 'ایمیل', 'subject': 'موضوع', 'message': 'پیام'}
+        context.update({field: form.data.get(field, '') for field in CONTACT_FIELDS})
 
-        for field in required_fields:
-            if not data[field]:
-                messages.error(request, f'❌ لطفاً {labels[field]} خود را وارد کنید.')
-                return render(request, self.template_name, context)
+        # Validation: report the first invalid field
+        if not form.is_valid():
+            field = next(field for field in CONTACT_FIELDS if field in form.errors)
+            if form.has_error(field, 'required'):
+                messages.error(request, f'❌ لطفاً {CONTACT_FIELD_LABELS[field]} خود را وارد کنید.')
+            else:
+                messages.error(request, f'❌ {CONTACT_FIELD_LABELS[field]} وارد شده معتبر نیست.')
+            return render(request, self.template_name, context)
 
         # Save message
         try:
-            ContactMessage.objects.create(
-                name=data['name'],
-                email=data['email'],
-                phone=data['phone'],
-                subject=data['subject'],
-                message=data['message'],
-                ip_address=self._get_client_ip(request)
-            )
+            contact_message = form.save(commit=False)
+            contact_message.ip_address = self._get_client_ip(request)
+            contact_message.save()
             messages.success(request, '✅ پیام شما با موفقیت ثبت شد. در اسرع وقت با شما تماس خواهیم گرفت.')
 
             # Clear form on success
-            context.update({field: '' for field in data})
+            context.update({field: '' for field in CONTACT_FIELDS})
 
         except Exception as e:
             messages.error(request, f'❌ خطایی در ثبت پیام رخ داد: {str(e)}')
@@ -235,9 +251,10 @@ class ContactView(View):
     def _get_base_context(self):
         """Generate default context including authentication state."""
         session = self.request.session
+        company_type = session.get('company_type')
         return {
-            'is_logged_in': bool(session.get('company_type') and session.get('company_id')),
-            'company_type': session.get('company_type'),
+            'is_logged_in': bool(company_type and session.get('company_id')),
+            'company_type': company_type,
             'name': '',
             'email': '',
             'subject': '',
@@ -249,7 +266,8 @@ class ContactView(View):
         """Extract client IP address from request headers."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
+            # Only the first (client) hop is needed; partition stops at the first comma
+            ip = x_forwarded_for.partition(',')[0].strip()
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
\ No newline at end of file
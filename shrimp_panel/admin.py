@@ -1,13 +1,8 @@
-import uuid
 from django.contrib import admin
-from django.utils.html import format_html
-from django.urls import path
-from django.shortcuts import redirect
-from django.utils import timezone
+from authentication.admin_mixins import ChangelistAdminMixin
 
 # Import models
 from .models import ShrimpProduct, RequestsProduct
-from authentication.models import ShrimpFarmingCompany, ExportingCompany
 from .forms import RequestsProductForm
 
 
@@ -26,7 +21,7 @@ class ShrimpProductAdmin(admin.ModelAdmin):
     - Displays key product details including company, weight, price
     - Filters by company, shrimp type, and date
     - Searchable by name, company, and support code
-    - Auto-generates 8-character UUID as support_code if missing
+    - support_code is filled in by the model field default
     """
 
     # Fields shown in the list view
@@ -71,15 +66,6 @@ class ShrimpProductAdmin(admin.ModelAdmin):
         }),
     )
 
-    def save_model(self, request, obj, form, change):
-        """
-        Generate a unique support code before saving if not already set.
-        Uses first 8 characters of a UUID4.
-        """
-        if not obj.support_code:
-            obj.support_code = str(uuid.uuid4())[:8].upper()
-        super().save_model(request, obj, form, change)
-
 
 # =============================================================================
 # ADMIN: PRODUCT REQUESTS MANAGEMENT
@@ -88,7 +74,7 @@ class ShrimpProductAdmin(admin.ModelAdmin):
 # =============================================================================
 
 @admin.register(RequestsProduct)
-class RequestsProductAdmin(admin.ModelAdmin):
+class RequestsProductAdmin(ChangelistAdminMixin, admin.ModelAdmin):
     """
     Admin interface for RequestsProduct model.
     
@@ -110,12 +96,16 @@ class RequestsProductAdmin(admin.ModelAdmin):
         'operation_date',
     ]
 
-    # Filters for quick navigation
+    # Join the relations read by the display methods below in one query
+    list_select_related = ['buyer_company', 'product', 'owner_company']
+
+    # Filters for quick navigation; company filters list only companies
+    # that appear on at least one request
     list_filter = [
         'status',
         'operation_date',
-        'buyer_company',
-        'owner_company',
+        ('buyer_company', admin.RelatedOnlyFieldListFilter),
+        ('owner_company', admin.RelatedOnlyFieldListFilter),
     ]
 
     # Search across names, codes, and relationships
@@ -136,6 +126,25 @@ class RequestsProductAdmin(admin.ModelAdmin):
         'owner_company',
     ]
 
+    def get_queryset(self, request):
+        """
+        Load only the columns the changelist renders.
+        The joined company rows would otherwise bring their address, logo
+        and password hash along with every request.
+        """
+        queryset = super().get_queryset(request)
+        if self._is_changelist(request):
+            queryset = queryset.only(
+                'support_code',
+                'status',
+                'operation_date',
+                'buyer_company__company_name',
+                'product__product_name',
+                'product__weight',
+                'owner_company__company_name',
+            )
+        return queryset
+
     def buyer_company_name(self, obj):
         """Display the name of the buying company."""
         return obj.buyer_company.company_name
@@ -1,78 +1,14 @@
 from django import forms
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
 # Import models
-from .models import ShrimpProduct, RequestsProduct
-from authentication.models import ShrimpFarmingCompany
-
-
-# =============================================================================
-# COMPANY PROFILE VIEW-FORM (READ-ONLY DISPLAY)
-# Used to show company details in dashboard with disabled inputs.
-# Not for editing; intended for visual consistency in templates.
-# =============================================================================
-
-class CompanyEditForm(forms.Form):
-    """
-    Read-only form for displaying shrimp farming company profile information.
-    
-    All fields are disabled to prevent editing through this form.
-    Used in dashboard templates where visual layout matters.
-    """
-
-    name = forms.CharField(
-        max_length=255,
-        label="نام شرکت",
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
-            'disabled': True
-        })
-    )
-
-    manager_name = forms.CharField(
-        max_length=255,
-        label="نام مدیرعامل",
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
-            'disabled': True
-        })
-    )
-
-    city = forms.CharField(
-        max_length=255,
-        label="شهر محل فعالیت",
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
-            'disabled': True
-        })
-    )
-
-    phone = forms.CharField(
-        max_length=15,
-        label="شماره تلفن",
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
-            'disabled': True
-        })
-    )
-
-    address = forms.CharField(
-        label="آدرس دقیق",
-        widget=forms.Textarea(attrs={
-            'class': 'form-control',
-            'disabled': True,
-            'rows': 3
-        })
-    )
-
-    logo = forms.ImageField(
-        required=False,
-        label="تغییر لوگوی شرکت",
-        widget=forms.FileInput(attrs={
-            'class': 'form-control',
-            'disabled': True
-        })
-    )
+from .models import (
+    SUPPORT_CODE_CACHE_TIMEOUT,
+    RequestsProduct,
+    ShrimpProduct,
+    support_code_cache_key,
+)
 
 
 # =============================================================================
@@ -115,6 +51,23 @@ class ShrimpProductForm(forms.ModelForm):
         }
 
 
+# =============================================================================
+# PRODUCT EDIT FORM
+# Validates the AJAX product edit before it is applied with one UPDATE.
+# Limits mirror the ShrimpProduct decimal columns.
+# =============================================================================
+
+class ShrimpProductEditForm(forms.Form):
+    """
+    Validate the editable product fields sent by the product list page.
+    Weight and price must be non-negative and fit their model columns.
+    """
+
+    product_name = forms.CharField(max_length=255)
+    weight = forms.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    price = forms.DecimalField(max_digits=12, decimal_places=2, min_value=0)
+
+
 # =============================================================================
 # PRODUCT REQUEST FORM
 # Validates support_code against existing ShrimpProduct entries.
@@ -144,8 +97,13 @@ class RequestsProductForm(forms.ModelForm):
         Raises ValidationError if not found.
         """
         support_code = self.cleaned_data['support_code']
-        if not ShrimpProduct.objects.filter(support_code=support_code).exists():
-            raise ValidationError("کد پشتیبانی وارد شده معتبر نیست.")
+        key = support_code_cache_key(support_code)
+        if not cache.get(key):
+            # Only hits are cached: the cache is per process, so a cached miss
+            # would hide a product that another worker has just created
+            if not ShrimpProduct.objects.filter(support_code=support_code).exists():
+                raise ValidationError("کد پشتیبانی وارد شده معتبر نیست.")
+            cache.set(key, True, SUPPORT_CODE_CACHE_TIMEOUT)
         return support_code
 
     class Meta:
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_hash_company_passwords'),
+        ('shrimp_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='requestsproduct',
+            name='shrimp_pane_buyer_c_669abd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='requestsproduct',
+            index=models.Index(fields=['buyer_company', 'status', 'product'], name='shrimp_pane_buyer_c_323c65_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_hash_company_passwords'),
+        ('shrimp_panel', '0002_remove_requestsproduct_shrimp_pane_buyer_c_669abd_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name='requestsproduct',
+            new_name='req_buyer_status_prod_idx',
+            old_name='shrimp_pane_buyer_c_323c65_idx',
+        ),
+        migrations.AddIndex(
+            model_name='requestsproduct',
+            index=models.Index(fields=['buyer_company', 'status', 'operation_date'], name='req_buyer_status_date_idx'),
+        ),
+    ]
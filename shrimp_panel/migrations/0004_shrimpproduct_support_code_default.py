@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:39
+
+import shrimp_panel.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shrimp_panel', '0003_rename_shrimp_pane_buyer_c_323c65_idx_req_buyer_status_prod_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='shrimpproduct',
+            name='support_code',
+            field=models.CharField(default=shrimp_panel.models.generate_support_code, editable=False, max_length=50, unique=True, verbose_name='Support Code'),
+        ),
+    ]
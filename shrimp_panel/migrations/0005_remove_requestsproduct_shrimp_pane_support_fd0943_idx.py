@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shrimp_panel', '0004_shrimpproduct_support_code_default'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='requestsproduct',
+            name='shrimp_pane_support_fd0943_idx',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shrimp_panel', '0005_remove_requestsproduct_shrimp_pane_support_fd0943_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='shrimpproduct',
+            name='shrimp_pane_support_f1fc9a_idx',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_hash_company_passwords'),
+        ('shrimp_panel', '0006_remove_shrimpproduct_shrimp_pane_support_f1fc9a_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shrimpproduct',
+            index=models.Index(fields=['company', '-created_at'], name='sp_company_created'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-15 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_hash_company_passwords'),
+        ('shrimp_panel', '0007_shrimpproduct_sp_company_created'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='requestsproduct',
+            name='shrimp_pane_owner_c_c185ad_idx',
+        ),
+        migrations.AddIndex(
+            model_name='requestsproduct',
+            index=models.Index(fields=['owner_company', '-operation_date', '-id'], name='req_owner_date_id_idx'),
+        ),
+    ]
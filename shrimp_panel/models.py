@@ -1,5 +1,8 @@
 import uuid
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 # Import related models
 from authentication.models import ShrimpFarmingCompany, ExportingCompany
@@ -8,9 +11,17 @@ from authentication.models import ShrimpFarmingCompany, ExportingCompany
 # =============================================================================
 # MODEL: SHRIMP PRODUCT
 # Represents a shrimp product listed by a farming company for sale or request.
-# Automatically generates a unique support code on first save.
+# Automatically generates a unique support code on creation.
 # =============================================================================
 
+def generate_support_code():
+    """
+    Default support code = first 8 hex characters of a UUID4, uppercased.
+    Example: 'A1B2C3D4'
+    """
+    return uuid.uuid4().hex[:8].upper()
+
+
 class ShrimpProduct(models.Model):
     """
     Model representing a shrimp product offered by a farming company.
@@ -37,6 +48,7 @@ class ShrimpProduct(models.Model):
         max_length=50,
         unique=True,
         editable=False,
+        default=generate_support_code,
         verbose_name="Support Code"
     )
 
@@ -48,24 +60,57 @@ class ShrimpProduct(models.Model):
         verbose_name_plural = "Shrimp Products"
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['support_code']),     # Speed up lookup by code
             models.Index(fields=['shrimp_type']),      # Improve filter performance
             models.Index(fields=['created_at']),       # Optimize date-based queries
+            # A company's products, newest first, without a sort step
+            models.Index(fields=['company', '-created_at'], name='sp_company_created'),
         ]
 
-    def save(self, *args, **kwargs):
-        """
-        Override save to auto-generate an 8-character uppercase UUID
-        as support_code if not already set.
-        """
-        if not self.support_code:
-            self.support_code = str(uuid.uuid4())[:8].upper()
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return f"{self.product_name} ({self.support_code})"
 
 
+# Support codes known to exist are cached; misses always query the database
+SUPPORT_CODE_CACHE_TIMEOUT = 300
+
+
+def support_code_cache_key(support_code):
+    """
+    Cache key for a support code existence check.
+    Example: 'sp:exists:A1B2C3D4'
+    """
+    return f"sp:exists:{support_code}"
+
+
+@receiver(post_save, sender=ShrimpProduct)
+@receiver(post_delete, sender=ShrimpProduct)
+def clear_support_code_cache(sender, instance, **kwargs):
+    """Drop the cached existence flag when a product is created or removed."""
+    cache.delete(support_code_cache_key(instance.support_code))
+
+
+# Farming company profiles are cached by id for the dashboard views.
+# LocMemCache is per process and the receivers below only clear the worker
+# that handled the write, so other workers may serve a stale (or deleted)
+# company until the entry expires; keep this short until CACHES is shared.
+COMPANY_CACHE_TIMEOUT = 10
+
+
+def company_cache_key(company_id):
+    """
+    Cache key for a farming company's dashboard profile.
+    Example: 'sfc:42'
+    """
+    return f"sfc:{company_id}"
+
+
+@receiver(post_save, sender=ShrimpFarmingCompany)
+@receiver(post_delete, sender=ShrimpFarmingCompany)
+def clear_company_cache(sender, instance, **kwargs):
+    """Drop the cached profile whenever the company is saved or deleted."""
+    cache.delete(company_cache_key(instance.id))
+
+
 # =============================================================================
 # MODEL: PRODUCT REQUEST
 # Tracks purchase requests made by exporting companies to farming companies.
@@ -120,11 +165,53 @@ class RequestsProduct(models.Model):
         ordering = ['-operation_date']
         indexes = [
             models.Index(fields=['status']),
-            models.Index(fields=['support_code']),
             models.Index(fields=['operation_date']),
-            models.Index(fields=['buyer_company']),
-            models.Index(fields=['owner_company']),
+            # Exporter's purchasable products (EXISTS on product) and pending ids
+            models.Index(fields=['buyer_company', 'status', 'product'], name='req_buyer_status_prod_idx'),
+            # Exporter's approved requests, newest first
+            models.Index(fields=['buyer_company', 'status', 'operation_date'], name='req_buyer_status_date_idx'),
+            # Farm's request list, newest first; also the keyset pagination seek
+            models.Index(fields=['owner_company', '-operation_date', '-id'], name='req_owner_date_id_idx'),
         ]
 
     def __str__(self):
-        return f"Request for {self.product.product_name} from {self.buyer_company.company_name}"
\ No newline at end of file
+        return f"Request for {self.product.product_name} from {self.buyer_company.company_name}"
+
+
+# Materialized request lists for the farming dashboard, keyed by owner company.
+# This assumes a single process: LocMemCache is per process and the receivers
+# below only clear the worker that handled the write, so other workers can
+# show a stale list until the entry expires.
+REQUESTS_LIST_CACHE_TIMEOUT = 60
+
+
+def requests_list_cache_key(company_id):
+    """
+    Cache key for a farming company's incoming request list.
+    Example: 'requests:list:42'
+    """
+    return f"requests:list:{company_id}"
+
+
+@receiver(post_save, sender=RequestsProduct)
+@receiver(post_delete, sender=RequestsProduct)
+def clear_requests_list_cache(sender, instance, **kwargs):
+    """Drop the owner's cached request list when one of its requests changes."""
+    cache.delete(requests_list_cache_key(instance.owner_company_id))
+
+
+@receiver(post_save, sender=ShrimpProduct)
+def clear_product_requests_list_cache(sender, instance, **kwargs):
+    """Drop the owner's cached request list, which shows product name and weight."""
+    cache.delete(requests_list_cache_key(instance.company_id))
+
+
+@receiver(post_save, sender=ExportingCompany)
+def clear_buyer_requests_list_caches(sender, instance, created, **kwargs):
+    """Drop the cached request lists of every farm the exporter has requested from."""
+    if created:
+        return
+    owner_ids = RequestsProduct.objects.filter(
+        buyer_company=instance
+    ).values_list('owner_company_id', flat=True).distinct()
+    cache.delete_many([requests_list_cache_key(owner_id) for owner_id in owner_ids])
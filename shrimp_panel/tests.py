@@ -1,3 +1,197 @@
+import json
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from authentication.models import ShrimpFarmingCompany, ExportingCompany
+from .forms import RequestsProductForm
+from .models import ShrimpProduct, RequestsProduct, support_code_cache_key
+from .views import REQUESTS_PAGE_SIZE
+
+
+def create_company(model, phone_number):
+    return model.objects.create(
+        company_name=f"Company {phone_number}",
+        ceo_name="CEO",
+        location="Bushehr",
+        address="Address",
+        phone_number=phone_number,
+        password="unused",
+    )
+
+
+class ShrimpPanelTestCase(TestCase):
+    """Two farming companies with one product each and a shared buyer."""
+
+    def setUp(self):
+        # Cached lookups must not leak from one test into the next
+        cache.clear()
+        self.company = create_company(ShrimpFarmingCompany, "09120000001")
+        self.other_company = create_company(ShrimpFarmingCompany, "09120000002")
+        self.buyer = create_company(ExportingCompany, "09120000003")
+        self.product = self.create_product(self.company)
+        self.other_product = self.create_product(self.other_company)
+
+        session = self.client.session
+        session["company_id"] = self.company.id
+        session["company_type"] = "shrimp"
+        session.save()
+
+    def create_product(self, company):
+        return ShrimpProduct.objects.create(
+            company=company, product_name="Vannamei", weight=100, shrimp_type="white", price=1000
+        )
+
+    def create_request(self, product, status="pending"):
+        return RequestsProduct.objects.create(
+            support_code=product.support_code,
+            buyer_company=self.buyer,
+            product=product,
+            owner_company=product.company,
+            status=status,
+        )
+
+    def request_action(self, action, pk, **extra):
+        return self.client.post(
+            reverse("shrimp_dashboard_request_action", args=[action, pk]), **extra
+        )
+
+
+class RequestsProductFormTests(ShrimpPanelTestCase):
+
+    def test_only_existing_support_codes_are_cached(self):
+        form = RequestsProductForm(data={"support_code": "MISSING1"})
+        self.assertIn("support_code", form.errors)
+        self.assertIsNone(cache.get(support_code_cache_key("MISSING1")))
+
+        form = RequestsProductForm(data={"support_code": self.product.support_code})
+        self.assertNotIn("support_code", form.errors)
+        self.assertTrue(cache.get(support_code_cache_key(self.product.support_code)))
+
+
+class ProductOwnershipTests(ShrimpPanelTestCase):
+
+    def test_cannot_edit_another_companys_product(self):
+        response = self.client.post(
+            reverse("shrimp_dashboard_edit_product", args=[self.other_product.id]),
+            {"product_name": "Changed", "weight": "1", "price": "1"},
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.other_product.refresh_from_db()
+        self.assertEqual(self.other_product.product_name, "Vannamei")
+
+    def test_cannot_delete_another_companys_product(self):
+        response = self.client.post(
+            reverse("shrimp_dashboard_delete_product", args=[self.other_product.id])
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(ShrimpProduct.objects.filter(pk=self.other_product.id).exists())
+
+
+class RequestsListViewTests(ShrimpPanelTestCase):
+
+    def test_product_and_buyer_edits_refresh_the_cached_list(self):
+        self.create_request(self.product)
+        self.client.get(reverse("shrimp_dashboard_requests_list"))
+
+        self.product.product_name = "Renamed product"
+        self.product.save()
+        self.buyer.company_name = "Renamed buyer"
+        self.buyer.save()
+
+        response = self.client.get(reverse("shrimp_dashboard_requests_list"))
+        self.assertContains(response, "Renamed product")
+        self.assertContains(response, "Renamed buyer")
+
+    def test_pages_follow_the_keyset_cursor(self):
+        created = [self.create_request(self.product) for _ in range(REQUESTS_PAGE_SIZE + 5)]
+        self.create_request(self.other_product)
+
+        response = self.client.get(reverse("shrimp_dashboard_requests_list"))
+        first_page = response.context["requests"]
+        self.assertEqual(len(first_page), REQUESTS_PAGE_SIZE)
+        self.assertTrue(response.context["has_more"])
+
+        last_request = response.context["last_request"]
+        response = self.client.get(
+            reverse("shrimp_dashboard_requests_list"),
+            {"before": last_request.operation_date.isoformat(), "before_id": last_request.id},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        data = response.json()
+        self.assertFalse(data["has_more"])
+
+        # Newest first, no overlap, and nothing from the other company
+        newest_first = sorted(created, key=lambda r: (r.operation_date, r.id), reverse=True)
+        self.assertEqual([r.id for r in first_page], [r.id for r in newest_first[:REQUESTS_PAGE_SIZE]])
+        self.assertEqual(data["before_id"], newest_first[-1].id)
+        self.assertEqual(data["html"].count("<tr"), 5)
+
+
+class RequestActionViewTests(ShrimpPanelTestCase):
+
+    def test_cannot_decide_another_companys_request(self):
+        request = self.create_request(self.other_product)
+
+        response = self.request_action("confirm", request.id, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 404)
+        request.refresh_from_db()
+        self.assertEqual(request.status, "pending")
+
+    def test_cannot_delete_another_companys_request(self):
+        request = self.create_request(self.other_product, status="approved")
+
+        response = self.request_action("delete", request.id)
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(RequestsProduct.objects.filter(pk=request.id).exists())
+
+    def test_repeat_decision_returns_conflict(self):
+        request = self.create_request(self.product)
+
+        response = self.request_action("confirm", request.id, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.request_action("reject", request.id, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(response.status_code, 409)
+        request.refresh_from_db()
+        self.assertEqual(request.status, "approved")
+
+
+class BatchUpdateRequestsTests(ShrimpPanelTestCase):
+
+    def batch(self, payload):
+        return self.client.post(
+            reverse("shrimp_dashboard_requests_batch"),
+            json.dumps(payload),
+            content_type="application/json",
+        )
+
+    def test_batch_only_touches_own_requests(self):
+        own = self.create_request(self.product)
+        foreign = self.create_request(self.other_product)
+        foreign_to_delete = self.create_request(self.other_product)
+
+        response = self.batch({
+            "approve": [own.id, foreign.id],
+            "delete": [foreign_to_delete.id],
+        })
+
+        self.assertEqual(response.json()["counts"], {"approve": 1, "reject": 0, "delete": 0})
+        own.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual(own.status, "approved")
+        self.assertEqual(foreign.status, "pending")
+        self.assertTrue(RequestsProduct.objects.filter(pk=foreign_to_delete.id).exists())
+
+    def test_batch_requires_a_logged_in_company(self):
+        request = self.create_request(self.product)
+        self.client.cookies.clear()
+
+        response = self.batch({"approve": [request.id]})
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 403)
+        request.refresh_from_db()
+        self.assertEqual(request.status, "pending")
@@ -67,20 +67,14 @@ urlpatterns = [
     ),
 
     path(
-        route='dashboard/request/confirm/<int:pk>/',
-        view=views.confirm_request,
-        name='shrimp_dashboard_request_confirm'
+        route='dashboard/request/<slug:action>/<int:pk>/',
+        view=views.RequestActionView.as_view(),
+        name='shrimp_dashboard_request_action'
     ),
 
     path(
-        route='dashboard/request/reject/<int:pk>/',
-        view=views.reject_request,
-        name='shrimp_dashboard_request_reject'
-    ),
-
-    path(
-        route='dashboard/request/delete/<int:pk>/',
-        view=views.delete_request,
-        name='shrimp_dashboard_request_delete'
+        route='dashboard/requests/batch/',
+        view=views.batch_update_requests,
+        name='shrimp_dashboard_requests_batch'
     ),
 ]
\ No newline at end of file
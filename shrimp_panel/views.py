@@ -1,75 +1,122 @@
-from django.shortcuts import render, redirect, get_object_or_404
+import json
+
+from django.shortcuts import render, redirect
 from django.views import View
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse
 from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_POST
+from authentication.forms import phone_number_error
 from authentication.models import ShrimpFarmingCompany
-from .models import ShrimpProduct, RequestsProduct
-from .forms import CompanyEditForm, ShrimpProductForm
+from .models import (
+    COMPANY_CACHE_TIMEOUT,
+    REQUESTS_LIST_CACHE_TIMEOUT,
+    RequestsProduct,
+    ShrimpProduct,
+    company_cache_key,
+    requests_list_cache_key,
+)
+from .forms import ShrimpProductEditForm, ShrimpProductForm
 
 
 # =============================================================================
-# SHIMP DASHBOARD: COMPANY PROFILE VIEW
-# Displays and allows editing of company information for shrimp farming companies.
+# SESSION HELPERS
+# Cached lookup of the logged-in shrimp farming company.
 # =============================================================================
 
-class ShrimpDashboardView(View):
+def get_company_cached(company_id):
     """
-    Render and handle updates to the shrimp farming company profile.
-    Uses session to authenticate and retrieve company data.
+    Return the farming company's profile by id, or None if it does not exist.
+    Served from the cache when possible; entries are dropped on save/delete.
+    The storage URL of the logo is resolved once per entry as logo_url.
+    """
+    key = company_cache_key(company_id)
+    company = cache.get(key)
+    if company is None:
+        company = ShrimpFarmingCompany.objects.only(
+            'id', 'company_name', 'ceo_name', 'location',
+            'phone_number', 'address', 'logo', 'updated_at'
+        ).filter(id=company_id).first()
+        if company is not None:
+            company.logo_url = company.logo.url if company.logo else None
+            cache.set(key, company, COMPANY_CACHE_TIMEOUT)
+    return company
+
+
+def get_session_company_id(request):
+    """Return the logged-in shrimp farming company's id, or None."""
+    if request.session.get('company_type') == 'shrimp':
+        return request.session.get('company_id')
+    return None
+
+
+class ShrimpCompanyRequiredMixin:
+    """
+    Require a logged-in shrimp farming company.
+    Resolves it once in dispatch() as self.company, or redirects to login.
     """
-    template_name = "admin/Shrimp Panel/Compnay Info.html"
+
+    def dispatch(self, request, *args, **kwargs):
+        self.company = self.get_company_from_session(request)
+        if not self.company:
+            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
+            return redirect('login')
+        return super().dispatch(request, *args, **kwargs)
 
     def get_company_from_session(self, request):
         """Retrieve authenticated shrimp farming company from session."""
-        company_id = request.session.get('company_id')
-        company_type = request.session.get('company_type')
-
-        if company_id and company_type == 'shrimp':
-            try:
-                return ShrimpFarmingCompany.objects.get(id=company_id)
-            except ShrimpFarmingCompany.DoesNotExist:
-                pass
+        company_id = get_session_company_id(request)
+        if company_id:
+            return get_company_cached(company_id)
         return None
 
-    def get(self, request):
-        """Display company info form with current data."""
-        company = self.get_company_from_session(request)
-        if not company:
-            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
-            return redirect('login')
 
-        initial_data = {
-            'name': company.company_name,
-            'manager_name': company.ceo_name,
-            'city': company.location,
-            'phone': company.phone_number,
-            'address': company.address,
-        }
-        company_form = CompanyEditForm(initial=initial_data)
+# =============================================================================
+# SHIMP DASHBOARD: COMPANY PROFILE VIEW
+# Displays and allows editing of company information for shrimp farming companies.
+# =============================================================================
 
-        return render(request, self.template_name, {
-            'company': company,
-            'company_form': company_form,
-        })
+class ShrimpDashboardView(ShrimpCompanyRequiredMixin, View):
+    """
+    Render and handle updates to the shrimp farming company profile.
+    Uses session to authenticate and retrieve company data.
+    """
+    template_name = "admin/Shrimp Panel/Compnay Info.html"
+
+    def get(self, request):
+        """Display company info; the template renders the fields directly."""
+        return render(request, self.template_name, {'company': self.company})
 
     def post(self, request):
         """Handle company profile update."""
-        company = self.get_company_from_session(request)
-        if not company:
-            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
-            return redirect('login')
+        company = self.company
 
         if 'edit_company' in request.POST:
+            phone = request.POST.get('phone', '').strip()
+            error = phone_number_error(company, phone)
+            if error:
+                messages.error(request, error)
+                return redirect('shrimp_dashboard_info')
+
             company.company_name = request.POST.get('name', '')
             company.ceo_name = request.POST.get('manager_name', '')
             company.location = request.POST.get('city', '')
-            company.phone_number = request.POST.get('phone', '')
+            company.phone_number = phone
             company.address = request.POST.get('address', '')
+            changed_fields = [
+                'company_name', 'ceo_name', 'location', 'phone_number', 'address', 'updated_at'
+            ]
 
             if 'logo' in request.FILES:
                 company.logo = request.FILES['logo']
+                changed_fields.append('logo')
 
-            company.save()
+            # Write only the edited columns (updated_at keeps auto_now working)
+            company.save(update_fields=changed_fields)
             messages.success(request, "اطلاعات شرکت با موفقیت ویرایش شد.")
 
         return redirect('shrimp_dashboard_info')
@@ -80,44 +127,26 @@ class ShrimpDashboardView(View):
 # Allows farming companies to add new shrimp products to their inventory.
 # =============================================================================
 
-class AddProductView(View):
+class AddProductView(ShrimpCompanyRequiredMixin, View):
     """
     Handle creation of new shrimp product listings.
     Associates product with the logged-in farming company.
     """
     template_name = "admin/Shrimp Panel/Add Product.html"
 
-    def get_company_from_session(self, request):
-        """Reuse session-based company retrieval."""
-        company_id = request.session.get('company_id')
-        company_type = request.session.get('company_type')
-
-        if company_id and company_type == 'shrimp':
-            try:
-                return ShrimpFarmingCompany.objects.get(id=company_id)
-            except ShrimpFarmingCompany.DoesNotExist:
-                pass
-        return None
-
     def get(self, request):
         """Show empty product form."""
-        company = self.get_company_from_session(request)
-        if not company:
-            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
-            return redirect('login')
+        company = self.company
 
         form = ShrimpProductForm()
         return render(request, self.template_name, {
             'form': form,
-            'company_logo': company.logo.url if company.logo else None,
+            'company_logo': company.logo_url,
         })
 
     def post(self, request):
         """Process product submission."""
-        company = self.get_company_from_session(request)
-        if not company:
-            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
-            return redirect('login')
+        company = self.company
 
         form = ShrimpProductForm(request.POST)
         if form.is_valid():
@@ -130,7 +159,7 @@ class AddProductView(View):
             messages.error(request, "ثبت محصول با خطا مواجه شد. لطفاً مجدداً تلاش کنید.")
             return render(request, self.template_name, {
                 'form': form,
-                'company_logo': company.logo.url if company.logo else None,
+                'company_logo': company.logo_url,
             })
 
 
@@ -146,11 +175,20 @@ class EditProductView(View):
     """
 
     def post(self, request, product_id):
-        product = get_object_or_404(ShrimpProduct, id=product_id)
-        product.product_name = request.POST.get('product_name', '')
-        product.weight = request.POST.get('weight', 0)
-        product.price = request.POST.get('price', 0)
-        product.save()
+        form = ShrimpProductEditForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({'status': 'invalid', 'errors': form.errors}, status=400)
+
+        # Ownership is enforced in the WHERE clause of a single UPDATE
+        updated = ShrimpProduct.objects.filter(
+            id=product_id, company_id=get_session_company_id(request)
+        ).update(**form.cleaned_data)
+
+        if not updated:
+            return JsonResponse({'status': 'not_found'}, status=404)
+
+        # update() skips signals; request lists show the product name and weight
+        cache.delete(requests_list_cache_key(get_session_company_id(request)))
         return JsonResponse({'status': 'success'})
 
 
@@ -166,8 +204,12 @@ class DeleteProductView(View):
     """
 
     def post(self, request, product_id):
-        product = get_object_or_404(ShrimpProduct, id=product_id)
-        product.delete()
+        deleted, _ = ShrimpProduct.objects.filter(
+            id=product_id, company_id=get_session_company_id(request)
+        ).delete()
+
+        if not deleted:
+            return JsonResponse({'status': 'not_found'}, status=404)
         return JsonResponse({'status': 'success'})
 
 
@@ -176,36 +218,24 @@ class DeleteProductView(View):
 # Displays all products registered by the logged-in farming company.
 # =============================================================================
 
-class RegisteredProductsView(View):
+class RegisteredProductsView(ShrimpCompanyRequiredMixin, View):
     """
     Show list of products owned by the authenticated farming company.
     Used in dashboard for management and tracking.
     """
     template_name = "admin/Shrimp Panel/Product List.html"
 
-    def get_company_from_session(self, request):
-        """Centralized company retrieval method."""
-        company_id = request.session.get('company_id')
-        company_type = request.session.get('company_type')
-
-        if company_id and company_type == 'shrimp':
-            try:
-                return ShrimpFarmingCompany.objects.get(id=company_id)
-            except ShrimpFarmingCompany.DoesNotExist:
-                pass
-        return None
-
     def get(self, request):
         """Fetch and display company's products."""
-        company = self.get_company_from_session(request)
-        if not company:
-            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
-            return redirect('login')
+        company = self.company
 
-        products = ShrimpProduct.objects.filter(company=company)
+        # The company is already known, so no join; load only the listed columns
+        products = ShrimpProduct.objects.filter(company=company).only(
+            'id', 'product_name', 'weight', 'price', 'support_code'
+        )
         return render(request, self.template_name, {
             'products': products,
-            'company_logo': company.logo.url if company.logo else None,
+            'company_logo': company.logo_url,
         })
 
 
@@ -214,96 +244,217 @@ class RegisteredProductsView(View):
 # Displays all requests made by exporters for this company's products.
 # =============================================================================
 
-class RequestsListView(View):
+# Requests shown per page; older pages are fetched by keyset on demand
+REQUESTS_PAGE_SIZE = 40
+
+
+class RequestsListView(ShrimpCompanyRequiredMixin, View):
     """
     Display list of purchase requests from exporting companies.
     Shows status, buyer info, and product details.
     """
     template_name = "admin/Shrimp Panel/Requests Product.html"
+    rows_template_name = "admin/Shrimp Panel/Requests Product Rows.html"
 
     def get(self, request):
-        """Fetch and show all relevant requests."""
-        company_id = request.session.get('company_id')
-        company_type = request.session.get('company_type')
-
-        if not company_id or company_type != 'shrimp':
-            messages.error(request, "لطفاً ابتدا وارد سیستم شوید.")
-            return redirect('login')
-
-        try:
-            farming_company = ShrimpFarmingCompany.objects.get(id=company_id)
-        except ShrimpFarmingCompany.DoesNotExist:
-            messages.error(request, "شرکت انتخاب نشده است.")
-            return redirect('login')
-
-        requests = RequestsProduct.objects.filter(
-            owner_company=farming_company
-        ).select_related('buyer_company', 'product').order_by('-operation_date')
+        """Show the newest requests, or the next older page for XHR calls."""
+        farming_company = self.company
+
+        cursor = self.get_cursor(request)
+        if cursor is None:
+            # The first page is cached; evaluated to a list so the cache
+            # stores rows, not a lazy queryset
+            key = requests_list_cache_key(farming_company.id)
+            requests = cache.get(key)
+            if requests is None:
+                requests = self.get_page(farming_company)
+                cache.set(key, requests, REQUESTS_LIST_CACHE_TIMEOUT)
+        else:
+            requests = self.get_page(farming_company, *cursor)
+
+        # One extra row is fetched to tell whether an older page exists
+        has_more = len(requests) > REQUESTS_PAGE_SIZE
+        requests = requests[:REQUESTS_PAGE_SIZE]
+        last_request = requests[-1] if requests else None
+
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'html': render_to_string(self.rows_template_name, {'requests': requests}, request=request),
+                'has_more': has_more,
+                'before': last_request.operation_date.isoformat() if last_request else None,
+                'before_id': last_request.id if last_request else None,
+            })
 
         return render(request, self.template_name, {
             'requests': requests,
-            'company_logo': farming_company.logo.url if farming_company.logo else None,
+            'has_more': has_more,
+            'last_request': last_request,
+            'company_logo': farming_company.logo_url,
         })
 
+    def get_cursor(self, request):
+        """
+        Read the keyset cursor (?before=<iso datetime>&before_id=<pk>).
+        Returns None for the first page or a malformed cursor.
+        """
+        try:
+            before = parse_datetime(request.GET.get('before', ''))
+            before_id = int(request.GET.get('before_id', ''))
+        except ValueError:
+            return None
+        if before is None:
+            return None
+        return before, before_id
+
+    def get_page(self, farming_company, before=None, before_id=None):
+        """Return up to REQUESTS_PAGE_SIZE + 1 requests older than the cursor."""
+        requests = RequestsProduct.objects.filter(owner_company=farming_company)
+        if before is not None:
+            requests = requests.filter(
+                Q(operation_date__lt=before) | Q(operation_date=before, id__lt=before_id)
+            )
+        return list(requests.select_related('buyer_company', 'product').only(
+            'id', 'support_code', 'status', 'operation_date',
+            'buyer_company__company_name',
+            'product__product_name', 'product__weight',
+        ).order_by('-operation_date', '-id')[:REQUESTS_PAGE_SIZE + 1])
+
 
 # =============================================================================
-# REQUEST MANAGEMENT: UPDATE STATUS (AJAX & REDIRECT)
-# Generic function to update request status (approve/reject/delete).
+# REQUEST MANAGEMENT: CONFIRM / REJECT / DELETE (AJAX & REDIRECT)
+# One view for all single-request actions, selected by the URL's action.
 # =============================================================================
 
-def update_request_status(request, pk, status):
+class RequestActionView(View):
     """
-    Update the status of a product request.
-    Can be called via AJAX or regular POST.
+    Confirm, reject or delete one purchase request.
+    Status changes can be called via AJAX or regular POST.
     Access-controlled by ownership check.
     """
-    if request.method != 'POST':
-        return JsonResponse({'status': 'error', 'message': 'درخواست نامعتبر است.'})
-
-    company_id = request.session.get('company_id')
-    if not company_id:
-        return JsonResponse({'status': 'error', 'message': 'شرکت انتخاب نشده است.'})
-
-    farming_company = get_object_or_404(ShrimpFarmingCompany, id=company_id)
-    request_obj = get_object_or_404(RequestsProduct, pk=pk, owner_company=farming_company)
-
-    request_obj.status = status
-    request_obj.save()
-
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return JsonResponse({'status': 'success', 'message': 'وضعیت درخواست با موفقیت تغییر یافت.'})
-    else:
-        messages.success(request, 'وضعیت درخواست با موفقیت تغییر یافت.')
+    # URL action mapped to the status it sets; None deletes the request
+    ACTIONS = {
+        'confirm': 'approved',
+        'reject': 'rejected',
+        'delete': None,
+    }
+
+    def post(self, request, action, pk):
+        if action not in self.ACTIONS:
+            raise Http404
+
+        status = self.ACTIONS[action]
+        if status is None:
+            return self.delete_request(request, pk)
+        return self.update_status(request, pk, status)
+
+    def update_status(self, request, pk, status):
+        """Set the request's status and answer with JSON or a redirect."""
+        # AJAX callers get JSON only; the messages framework (and the session
+        # write it causes) is reserved for the redirect path
+        is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+        company_id = get_session_company_id(request)
+        if not company_id:
+            if not is_ajax:
+                messages.error(request, 'شرکت انتخاب نشده است.')
+                return redirect('shrimp_dashboard_requests_list')
+            return JsonResponse({'status': 'error', 'message': 'شرکت انتخاب نشده است.'})
+
+        # One conditional UPDATE; ownership and the pending state are part of
+        # the WHERE clause, so concurrent decisions cannot overwrite each other
+        owned = RequestsProduct.objects.filter(pk=pk, owner_company_id=company_id)
+        updated = owned.filter(status='pending').update(status=status)
+        if not updated:
+            if owned.exists():
+                message, code = 'وضعیت این درخواست قبلاً تعیین شده است.', 409
+            else:
+                message, code = 'درخواست یافت نشد.', 404
+            if is_ajax:
+                return JsonResponse({'status': 'error', 'message': message}, status=code)
+            messages.error(request, message)
+            return redirect('shrimp_dashboard_requests_list')
+
+        # update() skips the post_save receiver that clears the cached list
+        cache.delete(requests_list_cache_key(company_id))
+
+        if is_ajax:
+            return JsonResponse({'status': 'success', 'message': 'وضعیت درخواست با موفقیت تغییر یافت.'})
+        else:
+            messages.success(request, 'وضعیت درخواست با موفقیت تغییر یافت.')
+            return redirect('shrimp_dashboard_requests_list')
+
+    def delete_request(self, request, pk):
+        """Delete a request (approved or rejected) and redirect back."""
+        company_id = get_session_company_id(request)
+        if not company_id:
+            messages.error(request, 'شرکت انتخاب نشده است.')
+            return redirect('shrimp_dashboard_requests_list')
+
+        # Ownership is enforced by the filter; no separate company lookup
+        deleted, _ = RequestsProduct.objects.filter(pk=pk, owner_company_id=company_id).delete()
+        if not deleted:
+            raise Http404
+        messages.success(request, 'درخواست با موفقیت حذف شد.')
         return redirect('shrimp_dashboard_requests_list')
 
 
-def confirm_request(request, pk):
-    """Approve a purchase request."""
-    return update_request_status(request, pk, 'approved')
+# =============================================================================
+# REQUEST MANAGEMENT: BATCH UPDATE (AJAX)
+# Approve, reject and delete several requests in a single call.
+# =============================================================================
 
+# Body keys of the batch endpoint mapped to the status they set
+BATCH_STATUS_ACTIONS = {
+    'approve': 'approved',
+    'reject': 'rejected',
+}
 
-def reject_request(request, pk):
-    """Reject a purchase request."""
-    return update_request_status(request, pk, 'rejected')
 
+def _parse_request_ids(value):
+    """Return a list of integer ids; raises ValueError on anything else."""
+    if not isinstance(value, list) or not all(
+        isinstance(item, int) and not isinstance(item, bool) for item in value
+    ):
+        raise ValueError('ids must be a list of integers')
+    return value
 
-def delete_request(request, pk):
-    """Delete a request (approved or rejected)."""
-    if request.method != 'POST':
-        messages.error(request, 'درخواست نامعتبر است.')
-        return redirect('shrimp_dashboard_requests_list')
 
-    company_id = request.session.get('company_id')
+@require_POST
+def batch_update_requests(request):
+    """
+    Apply several request decisions at once.
+    Body: {"approve": [ids], "reject": [ids], "delete": [ids]}
+    Each action is one statement scoped to the session company;
+    approve/reject only change requests that are still pending.
+    """
+    company_id = get_session_company_id(request)
     if not company_id:
-        messages.error(request, 'شرکت انتخاب نشده است.')
-        return redirect('shrimp_dashboard_requests_list')
-
-    farming_company = get_object_or_404(ShrimpFarmingCompany, id=company_id)
-    request_obj = get_object_or_404(RequestsProduct, pk=pk, owner_company=farming_company)
-
-    request_obj.delete()
-    messages.success(request, 'درخواست با موفقیت حذف شد.')
-    return redirect('shrimp_dashboard_requests_list')
+        return JsonResponse({'status': 'error', 'message': 'شرکت انتخاب نشده است.'}, status=403)
+
+    try:
+        payload = json.loads(request.body)
+        if not isinstance(payload, dict):
+            raise ValueError('body must be a JSON object')
+        ids = {
+            action: _parse_request_ids(payload.get(action, []))
+            for action in (*BATCH_STATUS_ACTIONS, 'delete')
+        }
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'درخواست نامعتبر است.'}, status=400)
+
+    owned = RequestsProduct.objects.filter(owner_company_id=company_id)
+    counts = {}
+    with transaction.atomic():
+        for action, status in BATCH_STATUS_ACTIONS.items():
+            counts[action] = owned.filter(
+                pk__in=ids[action], status='pending'
+            ).update(status=status) if ids[action] else 0
+        counts['delete'] = owned.filter(pk__in=ids['delete']).delete()[0] if ids['delete'] else 0
+
+    # update() skips the post_save receiver that clears the cached list
+    cache.delete(requests_list_cache_key(company_id))
+
+    return JsonResponse({'status': 'success', 'counts': counts})
 
 
 # =============================================================================